@@ -2,6 +2,18 @@
 Bots package initialization.
 """
 
-from .news_bot import NewsBot
+import importlib
+
+# NewsBot is resolved on first access so that the other bot runners, which
+# import their own bot modules, don't load the news bot and its feed stack
+_EXPORTS = {
+    'NewsBot': '.news_bot',
+}
 
 __all__ = ['NewsBot']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -14,6 +14,15 @@ logger = logging.getLogger(__name__)
 class BaseBot(ABC):
     """Abstract base class for all bot types."""
     
+    # Content items processed (LLM call + Telegram send) at the same time
+    MAX_CONCURRENT_SUGGESTIONS = 3
+    
+    # Subclasses that declare their own __slots__ get dict-free instances
+    __slots__ = (
+        'config', 'bot_id', 'name', 'token', 'owner_id', 'frequency', 'auto_post',
+        'x_credentials', 'application', 'running', '_stop_event', '_approval_markup',
+    )
+    
     def __init__(self, bot_config: Dict[str, Any]):
         """Initialize base bot with configuration."""
         self.config = bot_config
@@ -28,6 +37,14 @@ class BaseBot(ABC):
         # Telegram bot setup
         self.application = Application.builder().token(self.token).build()
         self.running = False
+        # Set by stop(); runners and the main loop wait on it instead of polling
+        self._stop_event = asyncio.Event()
+        
+        # Approval keyboard only depends on the bot id, so build it once
+        self._approval_markup = InlineKeyboardMarkup([
+            [InlineKeyboardButton(label, callback_data=f"{action}_{self.bot_id}")]
+            for label, action in (("✅ Post Tweet", "post"), ("✏️ Edit Tweet", "edit"), ("❌ Skip", "skip"))
+        ])
         
         # Setup base handlers
         self._setup_base_handlers()
@@ -59,6 +76,7 @@ class BaseBot(ABC):
         """Start the bot."""
         logger.info(f"Starting {self.get_bot_type()} bot: {self.name}")
         self.running = True
+        self._stop_event.clear()
         
         # Start Telegram bot
         await self.application.initialize()
@@ -74,12 +92,24 @@ class BaseBot(ABC):
         """Stop the bot."""
         logger.info(f"Stopping {self.get_bot_type()} bot: {self.name}")
         self.running = False
+        self._stop_event.set()
         
         if self.application.updater:
             await self.application.updater.stop()
         await self.application.stop()
         await self.application.shutdown()
     
+    async def wait_stopped(self):
+        """Wait until the bot is stopped."""
+        await self._stop_event.wait()
+    
+    async def _sleep(self, seconds: float):
+        """Sleep for the given time, returning early if the bot is stopped."""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+    
     async def _main_loop(self):
         """Main processing loop for the bot."""
         while self.running:
@@ -87,25 +117,37 @@ class BaseBot(ABC):
                 # Fetch new content
                 content_items = await self.fetch_content()
                 
-                for content in content_items:
-                    if not self.running:
-                        break
-                    
-                    # Process content and generate tweet
-                    tweet_text = await self.process_content(content)
-                    
-                    if tweet_text:
-                        # Send to owner for approval or auto-post
-                        await self._handle_tweet_suggestion(content, tweet_text)
+                # Generate and send suggestions concurrently, a few at a time
+                semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_SUGGESTIONS)
+                results = await asyncio.gather(
+                    *(self._suggest_tweet(content, semaphore) for content in content_items),
+                    return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error(f"Error processing content in {self.get_bot_type()} bot: {result}")
                 
                 # Wait for next cycle
                 if self.running:
-                    await asyncio.sleep(self.frequency * 3600)  # Convert hours to seconds
+                    await self._sleep(self.frequency * 3600)  # Convert hours to seconds
                     
             except Exception as e:
                 logger.error(f"Error in {self.get_bot_type()} bot main loop: {e}")
                 if self.running:
-                    await asyncio.sleep(300)  # Wait 5 minutes before retrying
+                    await self._sleep(300)  # Wait 5 minutes before retrying
+    
+    async def _suggest_tweet(self, content: Dict[str, Any], semaphore: asyncio.Semaphore):
+        """Generate a tweet for one content item and hand it off for approval or posting."""
+        async with semaphore:
+            if not self.running:
+                return
+            
+            # Process content and generate tweet
+            tweet_text = await self.process_content(content)
+            
+            if tweet_text:
+                # Send to owner for approval or auto-post
+                await self._handle_tweet_suggestion(content, tweet_text)
     
     async def _handle_tweet_suggestion(self, content: Dict[str, Any], tweet_text: str):
         """Handle tweet suggestion - either auto-post or ask for approval."""
@@ -129,13 +171,6 @@ class BaseBot(ABC):
     
     async def _send_tweet_for_approval(self, content: Dict[str, Any], tweet_text: str):
         """Send tweet suggestion to owner for approval."""
-        keyboard = [
-            [InlineKeyboardButton("✅ Post Tweet", callback_data=f"post_{self.bot_id}")],
-            [InlineKeyboardButton("✏️ Edit Tweet", callback_data=f"edit_{self.bot_id}")],
-            [InlineKeyboardButton("❌ Skip", callback_data=f"skip_{self.bot_id}")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
         message = (
             f"🤖 **{self.name}** - {self.get_bot_type().title()} Bot\n\n"
             f"**Suggested Tweet:**\n{tweet_text}\n\n"
@@ -145,18 +180,17 @@ class BaseBot(ABC):
         await self.application.bot.send_message(
             chat_id=self.owner_id,
             text=message,
-            reply_markup=reply_markup,
+            reply_markup=self._approval_markup,
             parse_mode='Markdown'
         )
     
     async def _post_to_x(self, tweet_text: str) -> bool:
         """Post tweet to X/Twitter."""
         try:
-            from utils.x_poster import XPoster
+            from utils.x_poster import get_x_poster
             
-            x_poster = XPoster(self.x_credentials)
-            result = await x_poster.post_tweet(tweet_text)
-            return result.get("success", False)
+            x_poster = get_x_poster(**self.x_credentials)
+            return await x_poster.post_tweet(tweet_text)
             
         except Exception as e:
             logger.error(f"Error posting to X: {e}")
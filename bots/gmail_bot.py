@@ -11,7 +11,7 @@ from datetime import datetime, timedelta
 from .base_bot import BaseBot
 from utils.gmail_client import GmailClient
 from utils.newsletter_parser import NewsletterParser
-from utils.text_generator import TextGenerator
+from utils.text_generator import get_text_generator
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +41,7 @@ class GmailBot(BaseBot):
         
         # Initialize parser and text generator
         self.parser = NewsletterParser()
-        self.text_generator = TextGenerator()
+        self.text_generator = get_text_generator()
         
         # Processed emails tracking
         self.processed_emails = set()
@@ -50,6 +50,12 @@ class GmailBot(BaseBot):
         """Return the bot type identifier."""
         return "gmail_agent"
     
+    async def stop(self):
+        """Stop the bot and close the Gmail client."""
+        await super().stop()
+        if self.gmail_client:
+            await self.gmail_client.close()
+    
     async def fetch_content(self) -> List[Dict[str, Any]]:
         """Fetch new newsletter emails from Gmail."""
         try:
@@ -85,6 +91,7 @@ class GmailBot(BaseBot):
             
             # Parse newsletters and return content
             content_items = []
+            newsletter_ids = []
             for email in new_emails:
                 parsed_content = await self.parser.parse_newsletter(email)
                 
@@ -92,9 +99,11 @@ class GmailBot(BaseBot):
                 if parsed_content.get('is_newsletter', False):
                     content_items.append(parsed_content)
                     self.processed_emails.add(email.get('id'))
-                    
-                    # Mark email as processed in Gmail
-                    await self.gmail_client.add_label(email.get('id'), 'BotProcessed')
+                    newsletter_ids.append(email.get('id'))
+            
+            # Mark the newsletters as processed in Gmail in one request
+            if newsletter_ids:
+                await self.gmail_client.add_label_batch(newsletter_ids, 'BotProcessed')
             
             return content_items
             
@@ -119,13 +128,15 @@ class GmailBot(BaseBot):
             
             # Filter articles by keywords if specified
             if self.keywords:
+                # Lowercase the keywords once, not once per article
+                keywords_lower = [keyword.lower() for keyword in self.keywords]
                 filtered_articles = []
                 for article in articles:
                     title_lower = article.get('title', '').lower()
                     context_lower = article.get('context', '').lower()
                     
-                    if any(keyword.lower() in title_lower or keyword.lower() in context_lower 
-                           for keyword in self.keywords):
+                    if any(keyword in title_lower or keyword in context_lower 
+                           for keyword in keywords_lower):
                         filtered_articles.append(article)
                 
                 articles = filtered_articles
@@ -166,11 +177,13 @@ class GmailBot(BaseBot):
             if not self.gmail_client:
                 return {}
             
-            # Get recent emails for stats
+            # Get recent emails for stats (headers only, bodies aren't needed)
             emails = await self.gmail_client.get_recent_emails(
                 query="label:BotProcessed",
                 max_results=50,
-                hours_back=24 * 7  # Last week
+                hours_back=24 * 7,  # Last week
+                format='metadata',
+                metadata_headers=['From', 'Date']
             )
             
             # Process stats
@@ -10,7 +10,8 @@ from datetime import datetime, timedelta
 
 from .base_bot import BaseBot
 from utils.job_monitor import JobMonitor
-from utils.text_generator import TextGenerator
+from utils.text_generator import get_text_generator
+from utils.state_store import PERSIST_INTERVAL, load_state, save_state, state_path
 
 logger = logging.getLogger(__name__)
 
@@ -27,18 +28,58 @@ class JobMonitorBot(BaseBot):
         self.location = self.job_config.get("location", "")
         self.job_boards = self.job_config.get("job_boards", ["indeed"])
         self.filters = self.job_config.get("filters", {})
+        self._merged_filters = self._merge_query_filters()
         self.last_search_time = datetime.now() - timedelta(hours=24)
         
         # Initialize job monitor
         self.job_monitor = JobMonitor()
         
         # Initialize text generator
-        self.text_generator = TextGenerator()
+        self.text_generator = get_text_generator()
         
-        # Processed jobs tracking
-        self.processed_jobs = set()
+        # Processed jobs tracking (restored from the last snapshot); the job
+        # monitor's bounded, expiring cache is the single record
+        self._state_path = state_path(f"job_monitor_{self.bot_id}")
+        self.job_monitor.restore_processed(load_state(self._state_path, []))
+        self.processed_jobs = self.job_monitor.processed_jobs
+        self._state_dirty = False
+        self._persist_task = None
         
-        logger.info(f"Job Monitor Bot initialized for {len(self.search_queries)} queries")
+        logger.info("Job Monitor Bot initialized for %s queries", len(self.search_queries))
+    
+    async def start(self):
+        """Start the bot along with the periodic state snapshot task."""
+        self._persist_task = asyncio.create_task(self._persist_loop())
+        await super().start()
+    
+    async def stop(self):
+        """Stop the bot, write a final state snapshot and close the job monitor's connections."""
+        if self._persist_task:
+            self._persist_task.cancel()
+        await self._persist_state()
+        await super().stop()
+        self.job_monitor.close()
+    
+    async def _persist_loop(self):
+        """Snapshot processed job IDs to disk periodically."""
+        while True:
+            await asyncio.sleep(PERSIST_INTERVAL)
+            await self._persist_state()
+    
+    async def _persist_state(self):
+        """Write processed job IDs to disk if they changed since the last snapshot."""
+        if not self._state_dirty:
+            return
+        self._state_dirty = False
+        if not await save_state(self._state_path, self.job_monitor.processed_snapshot()):
+            self._state_dirty = True
+    
+    def _merge_query_filters(self) -> List[Dict[str, Any]]:
+        """Merge bot-level filters with each query's own filters (aligned with search_queries)."""
+        return [
+            {**self.filters, **query_config.get("filters", {})}
+            for query_config in self.search_queries
+        ]
     
     def get_bot_type(self) -> str:
         """Return the bot type identifier."""
@@ -48,53 +89,55 @@ class JobMonitorBot(BaseBot):
         """Fetch new job postings from configured sources."""
         try:
             if not self.search_queries:
-                logger.warning(f"No search queries configured for bot {self.name}")
+                logger.warning("No search queries configured for bot %s", self.name)
                 return []
             
             all_jobs = []
             
             # Search for each configured query
-            for query_config in self.search_queries:
+            for query_config, merged_filters in zip(self.search_queries, self._merged_filters):
                 try:
                     query = query_config.get("query", "")
                     if not query:
-                        logger.warning(f"Empty query in configuration: {query_config}")
+                        logger.warning("Empty query in configuration: %s", query_config)
                         continue
                     
-                    logger.info(f"Searching for jobs: {query}")
+                    logger.info("Searching for jobs: %s", query)
                     
                     # Create search configuration
                     search_config = {
                         "query": query,
                         "location": query_config.get("location", self.location),
                         "job_boards": query_config.get("job_boards", self.job_boards),
-                        "filters": {
-                            **self.filters,
-                            **query_config.get("filters", {})
-                        }
+                        "filters": merged_filters
                     }
                     
                     # Search for jobs
                     jobs = await self.job_monitor.search_jobs(search_config)
                     
-                    # Filter out already processed jobs
-                    new_jobs = [
-                        job for job in jobs 
-                        if job.get('id') not in self.processed_jobs
-                    ]
-                    
-                    # Add query context to jobs
-                    for job in new_jobs:
+                    # Filter out already processed jobs and add query context in one pass
+                    processed_jobs = self.processed_jobs
+                    new_jobs = []
+                    new_ids = set()
+                    for job in jobs:
+                        jid = job.get('id')
+                        if jid in processed_jobs or jid in new_ids:
+                            continue
                         job['search_query'] = query
                         job['query_config'] = query_config
-                        self.processed_jobs.add(job.get('id'))
-                        self.job_monitor.mark_as_processed(job.get('id'))
+                        new_ids.add(jid)
+                        new_jobs.append(job)
+                    
+                    # Mark the whole batch processed in one call
+                    if new_ids:
+                        self.job_monitor.mark_batch_as_processed(new_ids)
+                        self._state_dirty = True
                     
                     all_jobs.extend(new_jobs)
-                    logger.info(f"Found {len(new_jobs)} new jobs for query: {query}")
+                    logger.info("Found %s new jobs for query: %s", len(new_jobs), query)
                     
                 except Exception as e:
-                    logger.error(f"Error searching for jobs with query '{query_config.get('query', 'unknown')}': {str(e)}")
+                    logger.error("Error searching for jobs with query '%s': %s", query_config.get('query', 'unknown'), e)
                     continue
             
             # Update last search time
@@ -103,11 +146,11 @@ class JobMonitorBot(BaseBot):
             # Sort by relevance/recency
             all_jobs.sort(key=lambda x: x.get('scraped_at', datetime.min), reverse=True)
             
-            logger.info(f"Job Monitor bot {self.name} found {len(all_jobs)} new jobs total")
+            logger.info("Job Monitor bot %s found %s new jobs total", self.name, len(all_jobs))
             return all_jobs
             
         except Exception as e:
-            logger.error(f"Error in Job Monitor bot {self.name} fetch_content: {str(e)}")
+            logger.error("Error in Job Monitor bot %s fetch_content: %s", self.name, e)
             return []
     
     async def process_content(self, content: Dict[str, Any]) -> Optional[str]:
@@ -122,7 +165,7 @@ class JobMonitorBot(BaseBot):
             search_query = content.get('search_query', '')
             
             if not title or not company:
-                logger.warning(f"Missing title or company in job posting: {content}")
+                logger.warning("Missing title or company in job posting: %s", content)
                 return None
             
             # Prepare content for text generation
@@ -140,14 +183,14 @@ class JobMonitorBot(BaseBot):
             tweet_text = await self.text_generator.generate_job_tweet(processed_content)
             
             if tweet_text:
-                logger.info(f"Generated tweet for job: {title} at {company}")
+                logger.info("Generated tweet for job: %s at %s", title, company)
                 return tweet_text
             else:
-                logger.warning(f"Failed to generate tweet for job: {title} at {company}")
+                logger.warning("Failed to generate tweet for job: %s at %s", title, company)
                 return None
                 
         except Exception as e:
-            logger.error(f"Error processing job content in Job Monitor bot {self.name}: {str(e)}")
+            logger.error("Error processing job content in Job Monitor bot %s: %s", self.name, e)
             return None
     
     async def get_status_info(self) -> Dict[str, Any]:
@@ -166,50 +209,51 @@ class JobMonitorBot(BaseBot):
                 "auto_post": self.auto_post
             }
         except Exception as e:
-            logger.error(f"Error getting status info for Job Monitor bot {self.name}: {str(e)}")
+            logger.error("Error getting status info for Job Monitor bot %s: %s", self.name, e)
             return {}
     
     async def get_configuration_summary(self) -> str:
         """Get a human-readable configuration summary."""
         try:
-            summary = f"💼 *Job Monitor Bot: {self.name}*\n\n"
-            summary += f"📊 *Status:* {'Running' if self.running else 'Stopped'}\n"
-            summary += f"⏰ *Frequency:* Every {self.frequency} hours\n"
-            summary += f"🚀 *Auto-post:* {'Enabled' if self.auto_post else 'Disabled'}\n"
-            summary += f"📍 *Location:* {self.location or 'Any'}\n\n"
-            
-            summary += f"🔍 *Search Queries ({len(self.search_queries)}):*\n"
-            for i, query_config in enumerate(self.search_queries[:5], 1):  # Show first 5
-                query = query_config.get('query', 'Unknown')
-                summary += f"  {i}. {query}\n"
+            buf = [
+                f"💼 *Job Monitor Bot: {self.name}*\n\n",
+                f"📊 *Status:* {'Running' if self.running else 'Stopped'}\n",
+                f"⏰ *Frequency:* Every {self.frequency} hours\n",
+                f"🚀 *Auto-post:* {'Enabled' if self.auto_post else 'Disabled'}\n",
+                f"📍 *Location:* {self.location or 'Any'}\n\n",
+                f"🔍 *Search Queries ({len(self.search_queries)}):*\n"
+            ]
+            buf.extend(  # Show first 5
+                f"  {i}. {query_config.get('query', 'Unknown')}\n"
+                for i, query_config in enumerate(self.search_queries[:5], 1)
+            )
             
             if len(self.search_queries) > 5:
-                summary += f"  ... and {len(self.search_queries) - 5} more\n"
+                buf.append(f"  ... and {len(self.search_queries) - 5} more\n")
             
-            summary += f"\n🌐 *Job Boards ({len(self.job_boards)}):*\n"
+            buf.append(f"\n🌐 *Job Boards ({len(self.job_boards)}):*\n")
             board_names = {
                 'indeed': 'Indeed',
                 'linkedin': 'LinkedIn',
                 'glassdoor': 'Glassdoor'
             }
-            for board in self.job_boards:
-                summary += f"  • {board_names.get(board, board.title())}\n"
+            buf.extend(f"  • {board_names.get(board, board.title())}\n" for board in self.job_boards)
             
             if self.filters:
-                summary += f"\n🎯 *Filters:*\n"
+                buf.append(f"\n🎯 *Filters:*\n")
                 if self.filters.get('required_keywords'):
-                    summary += f"  • Required: {', '.join(self.filters['required_keywords'][:3])}\n"
+                    buf.append(f"  • Required: {', '.join(self.filters['required_keywords'][:3])}\n")
                 if self.filters.get('exclude_keywords'):
-                    summary += f"  • Exclude: {', '.join(self.filters['exclude_keywords'][:3])}\n"
+                    buf.append(f"  • Exclude: {', '.join(self.filters['exclude_keywords'][:3])}\n")
             
-            summary += f"\n📈 *Stats:*\n"
-            summary += f"  • Processed jobs: {len(self.processed_jobs)}\n"
-            summary += f"  • Last search: {self.last_search_time.strftime('%Y-%m-%d %H:%M') if self.last_search_time else 'Never'}\n"
+            buf.append(f"\n📈 *Stats:*\n")
+            buf.append(f"  • Processed jobs: {len(self.processed_jobs)}\n")
+            buf.append(f"  • Last search: {self.last_search_time.strftime('%Y-%m-%d %H:%M') if self.last_search_time else 'Never'}\n")
             
-            return summary
+            return "".join(buf)
             
         except Exception as e:
-            logger.error(f"Error generating configuration summary for Job Monitor bot {self.name}: {str(e)}")
+            logger.error("Error generating configuration summary for Job Monitor bot %s: %s", self.name, e)
             return f"Error generating summary for {self.name}"
     
     async def test_connection(self) -> Dict[str, Any]:
@@ -234,10 +278,13 @@ class JobMonitorBot(BaseBot):
                 }
             
             try:
-                # Test job search
-                test_result = await self.job_monitor.test_search(
-                    query=query,
-                    location=query_config.get('location', self.location)
+                # Test job search (bounded so a hung job board can't stall the reply)
+                test_result = await asyncio.wait_for(
+                    self.job_monitor.test_search(
+                        query=query,
+                        location=query_config.get('location', self.location)
+                    ),
+                    timeout=15.0
                 )
                 
                 return {
@@ -259,6 +306,12 @@ class JobMonitorBot(BaseBot):
                     }
                 }
                 
+            except asyncio.TimeoutError:
+                return {
+                    "success": False,
+                    "message": "Job search test timed out after 15s",
+                    "details": {"error": "timeout"}
+                }
             except Exception as e:
                 return {
                     "success": False,
@@ -267,7 +320,7 @@ class JobMonitorBot(BaseBot):
                 }
             
         except Exception as e:
-            logger.error(f"Error testing Job Monitor bot connection: {str(e)}")
+            logger.error("Error testing Job Monitor bot connection: %s", e)
             return {
                 "success": False,
                 "message": f"Test failed: {str(e)}",
@@ -52,9 +52,8 @@ async def main():
         bot = JobMonitorBot(bot_config)
         await bot.start()
         
-        # Keep the bot running
-        while bot.running:
-            await asyncio.sleep(1)
+        # Keep the bot running until it is stopped
+        await bot.wait_stopped()
             
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
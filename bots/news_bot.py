@@ -3,62 +3,245 @@ Individual news bot that fetches news and generates tweet suggestions.
 Can be run as a standalone process with bot configuration.
 """
 
+from __future__ import annotations
+
 import asyncio
+import contextlib
+import hashlib
+import itertools
 import logging
+import logging.handlers
+import queue
+import random
+import secrets
 import sys
 import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
+
+# telegram (with httpx) is imported where it's first needed rather than here, so
+# importing this module - as the bots package does - stays cheap; these names
+# are only used in annotations at module level
+if TYPE_CHECKING:
+    from telegram import Update, InlineKeyboardMarkup, MessageEntity
+    from telegram.ext import ContextTypes
 
-# Load environment variables
-load_dotenv()
+# Load environment variables when run as a bot process
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from botfather.config_manager import ConfigManager
-from sources.rss_fetcher import RSSFetcher
-from utils.text_generator import TextGenerator
-from utils.x_poster import XPoster
+from sources.rss_fetcher import Article, RSSFetcher
+from utils.dedup_store import DedupStore
+from utils.url_lru import url_key
 
 logger = logging.getLogger(__name__)
 
+# Seconds a sent article link is remembered for deduplication
+SENT_ARTICLES_MAX_AGE = 30 * 24 * 3600
+
+# Number of generated tweet sets cached by article content
+TWEET_CACHE_SIZE = 512
+
+# Seconds a set of tweet suggestions stays actionable from the inline buttons
+PENDING_TWEETS_TTL = 3600
+
+# Upper bound (seconds) for the adaptive fetch interval; it never drops below the
+# configured frequency
+MAX_FETCH_INTERVAL = int(os.getenv('NEWS_MAX_FETCH_INTERVAL', 24 * 3600))
+
+def _title_key(title: str) -> int:
+    """Fingerprint a headline, ignoring case and whitespace differences."""
+    return url_key(" ".join(title.lower().split()))
+
+def _utf16_len(text: str) -> int:
+    """Length of text in UTF-16 code units, the unit Telegram entity offsets use."""
+    return len(text.encode('utf-16-le')) // 2
+
+def _tweet_keyboard(n_tweets: int, suggestion_id: str) -> InlineKeyboardMarkup:
+    """Inline keyboard for one set of tweet suggestions, bound to its pending entry."""
+    from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+    
+    # Short callback data: "t1:<id>", "t2:<id>", "t3:<id>"
+    keyboard = [
+        [InlineKeyboardButton(f"✅ Post {i+1}", callback_data=f"t{i+1}:{suggestion_id}")]
+        for i in range(n_tweets)
+    ]
+    keyboard.append([InlineKeyboardButton("❌ Skip", callback_data=f"skip:{suggestion_id}")])
+    return InlineKeyboardMarkup(keyboard)
+
+# Callback action -> tweet index ("t1" -> 0, ...), with SKIP_ACTION for the Skip button
+SKIP_ACTION = -1
+_CALLBACK_ACTIONS = {"skip": SKIP_ACTION, **{f"t{i + 1}": i for i in range(9)}}
+
 class NewsBot:
+    # One long-lived instance per process; fixed slots instead of a per-instance dict
+    __slots__ = (
+        'bot_id', 'config', 'token', 'owner_id', 'name', 'niche', 'frequency', 'auto_post',
+        'application', 'rss_fetcher', 'sent_articles', 'sent_titles', 'last_cleanup_time', 'pending_tweets',
+        '_parse_pool', '_text_generator', '_x_poster', '_fetch_task', '_next_fetch_text',
+        '_fetch_interval', '_recent_new_counts', '_tweet_cache', '_niche_title', '_welcome_text',
+        '_help_text', '_status_head', '_status_tail', '_settings_head', '_settings_tail',
+    )
+    
     def __init__(self, bot_id: str, config: Dict[str, Any]):
         """Initialize news bot with configuration."""
         self.bot_id = bot_id
         self.config = config
         self.token = config['token']
-        self.application = Application.builder().token(self.token).build()
-          # Initialize components
-        self.rss_fetcher = RSSFetcher(config['niche'], config.get('custom_sources', []))
-        self.text_generator = TextGenerator()
-        
-        # Initialize X poster with bot-specific credentials
-        x_creds = config.get('x_credentials', {})
-        self.x_poster = XPoster(
-            bearer_token=x_creds.get('bearer_token'),
-            api_key=x_creds.get('api_key'),
-            api_secret=x_creds.get('api_secret'),
-            access_token=x_creds.get('access_token'),
-            access_token_secret=x_creds.get('access_token_secret')
+        self.owner_id = config['owner_id']
+        self.name = config['name']
+        self.niche = config['niche']
+        self.frequency = config['frequency']
+        self.auto_post = config['auto_post']
+        from telegram.ext import Application, Defaults
+        
+        # Handlers run concurrently so a slow /latest doesn't stall other updates;
+        # every message from this bot is Markdown
+        self.application = (
+            Application.builder()
+            .token(self.token)
+            .defaults(Defaults(block=False, parse_mode='Markdown'))
+            .build()
         )
-          # Setup scheduler
-        self.scheduler = AsyncIOScheduler()
+          # Initialize components
+        # Feeds and article pages are parsed off the event loop on one thread of
+        # their own, so parsing doesn't crowd out the default pool's downloads; a
+        # cycle parses only a handful of feeds, not enough to pay for worker processes
+        self._parse_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='feed-parse')
+        self.rss_fetcher = RSSFetcher(self.niche, config.get('custom_sources', []),
+                                      parse_executor=self._parse_pool)
         
-        # Track sent articles to avoid duplicates (with periodic cleanup)
-        self.sent_articles = set()
+        # The OpenAI and X clients are created on first use (see the properties below)
+        self._text_generator = None
+        self._x_poster = None
+        
+        # Fingerprints of sent articles live in the shared SQLite dedup store, so
+        # restarts (and crashes) don't re-send articles
+        self.sent_articles = DedupStore(f"news_bot_{bot_id}")
+        # Headlines of sent articles too, so a story republished by another source
+        # (or under a new link) isn't suggested again in a later fetch
+        self.sent_titles = DedupStore(f"news_bot_{bot_id}_titles")
         self.last_cleanup_time = datetime.now()
         
+        # Periodic fetch task, its next run (formatted for /status when scheduled) and
+        # new-article counts of recent fetches, used to stretch or shrink the interval
+        self._fetch_task = None
+        self._next_fetch_text = "Not scheduled"
+        self._fetch_interval = self.frequency * 3600
+        self._recent_new_counts = deque(maxlen=10)
+        
+        # Tweets generated per article content, so syndicated copies skip the LLM
+        self._tweet_cache = OrderedDict()
+        
+        # Command replies only depend on config fixed at boot, so build them once
+        self._niche_title = self.niche.title()
+        self._welcome_text = f"""
+🤖 **{self.name} is active!**
+
+I'm your {self.niche} news bot. I'll fetch the latest news and suggest tweets for you.
+
+**Configuration:**
+• **Update Frequency:** Every {self.frequency} hour(s)
+• **Auto-post:** {'Enabled ✅' if self.auto_post else 'Manual approval required 👤'}
+
+**Commands:**
+• /help - Show all available commands
+• /status - Check bot status
+• /settings - View bot configuration
+• /latest - Get latest news manually
+
+I'll start sending you news updates automatically!
+        """
+        self._help_text = f"""
+🤖 **{self.name} Help**
+
+**Available Commands:**
+• `/start` - Bot welcome message
+• `/help` - Show this help message
+• `/status` - Check bot status and next update time
+• `/settings` - View bot configuration
+• `/latest` - Manually fetch latest news now
+
+**How I Work:**
+1. 🔍 I fetch {self.niche} news every {self.frequency} hour(s)
+2. ✍️ I generate 1-3 tweet suggestions using AI
+3. 📱 {'I auto-post approved tweets' if self.auto_post else 'I ask for your approval before posting'}
+
+**Need help?** Just send `/latest` to get immediate news updates!
+        """
+        # Status only varies in the next update time and sent count, which go in between
+        self._status_head = f"""
+📊 **Bot Status**
+
+• **Name:** {self.name}
+• **Niche:** {self._niche_title}
+• **Status:** 🟢 Active
+• **Next update:** """
+        self._status_tail = f"""
+• **Auto-post:** {'Yes ✅' if self.auto_post else 'No 👤'}        """
+        # Settings only vary in the processed-articles count, which goes in between
+        sources_count = len(self.rss_fetcher.sources) if hasattr(self.rss_fetcher, 'sources') else 0
+        self._settings_head = f"""
+⚙️ **Bot Settings**
+
+**Basic Configuration:**
+• **Name:** {self.name}
+• **Niche:** {self._niche_title}
+• **Update Frequency:** Every {self.frequency} hour(s)
+• **Auto-posting:** {'Enabled ✅' if self.auto_post else 'Disabled (Manual approval) 👤'}
+
+**News Sources:**
+• **Source Type:** {'Custom RSS feeds' if self.config.get('custom_sources') else 'Default ' + self.niche + ' sources'}
+• **Total Sources:** {sources_count} RSS feeds
+
+**Stats:**
+• **Articles Processed:** """
+        self._settings_tail = f"""
+• **Bot Status:** 🟢 Active and Running
+
+**Bot Token:** `{self.token[:10]}...` (hidden for security)
+
+*To modify these settings, use the BotFather controller bot.*
+        """
+        
         # Setup handlers
         self._setup_handlers()
     
+    @property
+    def text_generator(self):
+        """Shared tweet generator, imported and created on first use."""
+        if self._text_generator is None:
+            from utils.text_generator import get_text_generator
+            self._text_generator = get_text_generator()
+        return self._text_generator
+    
+    @property
+    def x_poster(self):
+        """X poster for this bot's credentials, imported and created on first use."""
+        if self._x_poster is None:
+            from utils.x_poster import get_x_poster
+            x_creds = self.config.get('x_credentials', {})
+            self._x_poster = get_x_poster(
+                bearer_token=x_creds.get('bearer_token'),
+                api_key=x_creds.get('api_key'),
+                api_secret=x_creds.get('api_secret'),
+                access_token=x_creds.get('access_token'),
+                access_token_secret=x_creds.get('access_token_secret')
+            )
+        return self._x_poster
+    
     def _setup_handlers(self):
         """Setup command and callback handlers."""
+        from telegram.ext import CommandHandler, CallbackQueryHandler
+        
         self.application.add_handler(CommandHandler("start", self.start_command))
         self.application.add_handler(CommandHandler("help", self.help_command))
         self.application.add_handler(CommandHandler("status", self.status_command))
@@ -70,42 +253,15 @@ class NewsBot:
     
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command."""
-        welcome_text = f"""
-🤖 **{self.config['name']} is active!**
-
-I'm your {self.config['niche']} news bot. I'll fetch the latest news and suggest tweets for you.
-
-**Configuration:**
-• **Update Frequency:** Every {self.config['frequency']} hour(s)
-• **Auto-post:** {'Enabled ✅' if self.config['auto_post'] else 'Manual approval required 👤'}
-
-**Commands:**
-• /help - Show all available commands
-• /status - Check bot status
-• /settings - View bot configuration
-• /latest - Get latest news manually
-
-I'll start sending you news updates automatically!
-        """
-        await update.message.reply_text(welcome_text, parse_mode='Markdown')
+        await update.message.reply_text(self._welcome_text)
     
     async def status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show bot status."""
-        next_run = "Not scheduled"
-        if self.scheduler.get_jobs():
-            job = self.scheduler.get_jobs()[0]
-            next_run = job.next_run_time.strftime("%Y-%m-%d %H:%M:%S") if job.next_run_time else "Not scheduled"
-        
-        status_text = f"""
-📊 **Bot Status**
-
-• **Name:** {self.config['name']}
-• **Niche:** {self.config['niche'].title()}
-• **Status:** 🟢 Active
-• **Next update:** {next_run}
-• **Articles sent:** {len(self.sent_articles)}
-• **Auto-post:** {'Yes ✅' if self.config['auto_post'] else 'No 👤'}        """
-        await update.message.reply_text(status_text, parse_mode='Markdown')
+        status_text = (
+            f"{self._status_head}{self._next_fetch_text}\n"
+            f"• **Articles sent:** {await self.sent_articles.count()}{self._status_tail}"
+        )
+        await update.message.reply_text(status_text)
     
     async def latest_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Manually fetch and send latest news."""
@@ -128,246 +284,320 @@ I'll start sending you news updates automatically!
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command."""
-        help_text = f"""
-🤖 **{self.config['name']} Help**
-
-**Available Commands:**
-• `/start` - Bot welcome message
-• `/help` - Show this help message
-• `/status` - Check bot status and next update time
-• `/settings` - View bot configuration
-• `/latest` - Manually fetch latest news now
-
-**How I Work:**
-1. 🔍 I fetch {self.config['niche']} news every {self.config['frequency']} hour(s)
-2. ✍️ I generate 1-3 tweet suggestions using AI
-3. 📱 {'I auto-post approved tweets' if self.config['auto_post'] else 'I ask for your approval before posting'}
-
-**Need help?** Just send `/latest` to get immediate news updates!
-        """
-        await update.message.reply_text(help_text, parse_mode='Markdown')
+        await update.message.reply_text(self._help_text)
 
     async def settings_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /settings command."""
-        # Count RSS sources
-        sources_count = len(self.rss_fetcher.sources) if hasattr(self.rss_fetcher, 'sources') else 0
-        
-        settings_text = f"""
-⚙️ **Bot Settings**
-
-**Basic Configuration:**
-• **Name:** {self.config['name']}
-• **Niche:** {self.config['niche'].title()}
-• **Update Frequency:** Every {self.config['frequency']} hour(s)
-• **Auto-posting:** {'Enabled ✅' if self.config['auto_post'] else 'Disabled (Manual approval) 👤'}
-
-**News Sources:**
-• **Source Type:** {'Custom RSS feeds' if self.config.get('custom_sources') else 'Default ' + self.config['niche'] + ' sources'}
-• **Total Sources:** {sources_count} RSS feeds
-
-**Stats:**
-• **Articles Processed:** {len(self.sent_articles)}
-• **Bot Status:** 🟢 Active and Running
-
-**Bot Token:** `{self.config['token'][:10]}...` (hidden for security)
-
-*To modify these settings, use the BotFather controller bot.*
-        """
-        await update.message.reply_text(settings_text, parse_mode='Markdown')
+        settings_text = f"{self._settings_head}{await self.sent_articles.count()}{self._settings_tail}"
+        await update.message.reply_text(settings_text)
     
     async def button_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle inline button callbacks."""
         query = update.callback_query
         await query.answer()
         
-        user_id = query.from_user.id
-        data = query.data
+        # Suggestions are only made to (and actionable by) the bot owner
+        if query.from_user.id != self.owner_id:
+            return
         
-        # Check if we have pending tweets for this user
-        if user_id not in self.pending_tweets:
-            await query.edit_message_text("❌ Tweet data expired. Please request new tweets.")
+        # Each message's buttons carry the id of its own pending suggestions
+        action_name, _, suggestion_id = query.data.partition(':')
+        action = _CALLBACK_ACTIONS.get(action_name)
+        if action is None:
+            await query.edit_message_text("❌ Unknown action.")
             return
         
-        pending_data = self.pending_tweets[user_id]
+        # Check if these suggestions are still pending
+        pending_data = self.pending_tweets.get(suggestion_id)
+        if pending_data is None or pending_data['expires'] < time.monotonic():
+            self.pending_tweets.pop(suggestion_id, None)
+            await query.edit_message_text("❌ Tweet data expired. Please request new tweets.")
+            return
         tweets = pending_data['tweets']
-        article = pending_data['article']
         
-        if data == "skip":
+        if action == SKIP_ACTION:
             await query.edit_message_text("⏭️ **Skipped this article.**")
             # Clean up
-            del self.pending_tweets[user_id]
+            self.pending_tweets.pop(suggestion_id, None)
             return
         
-        if data.startswith("t"):
-            try:
-                tweet_index = int(data[1]) - 1  # Convert "t1", "t2", "t3" to 0, 1, 2
-                
-                if 0 <= tweet_index < len(tweets):
-                    tweet_text = tweets[tweet_index]
-                    
-                    # Post the tweet
-                    success = await self.x_poster.post_tweet(tweet_text)
-                    if success:
-                        await query.edit_message_text(
-                            f"✅ **Tweet posted successfully!**\n\n📱 Tweet: {tweet_text}",
-                            parse_mode='Markdown'
-                        )
-                    else:
-                        await query.edit_message_text(
-                            f"✅ **Tweet simulated (no X token provided)**\n\n📱 Tweet: {tweet_text}",
-                            parse_mode='Markdown'
-                        )
-                      # Clean up
-                    del self.pending_tweets[user_id]
-                else:
-                    await query.edit_message_text("❌ Invalid tweet selection.")
-                    
-            except (ValueError, IndexError):
-                await query.edit_message_text("❌ Invalid selection.")
-        else:
-            await query.edit_message_text("❌ Unknown action.")
+        if action >= len(tweets):
+            await query.edit_message_text("❌ Invalid tweet selection.")
+            return
+        
+        tweet_text = tweets[action]
+        
+        # Post the tweet
+        success = await self.x_poster.post_tweet(tweet_text)
+        status = "Tweet posted successfully!" if success else "Tweet simulated (no X token provided)"
+        
+        # The tweet is generated text, so it goes out unparsed with the heading bolded
+        # by an entity; Markdown would reject any unbalanced _, * or ` in it
+        from telegram import MessageEntity
+        prefix = "✅ "
+        await query.edit_message_text(
+            f"{prefix}{status}\n\n📱 Tweet: {tweet_text}",
+            parse_mode=None,
+            entities=[MessageEntity(MessageEntity.BOLD, _utf16_len(prefix), _utf16_len(status))]
+        )
+        # Clean up
+        self.pending_tweets.pop(suggestion_id, None)
     
     async def fetch_and_send_news(self):
         """Fetch news and send tweet suggestions."""
         try:
+            await self._prune_sent_articles()
+            
             # Fetch latest articles
             articles = await self.rss_fetcher.fetch_latest_articles()
             
             if not articles:
                 logger.info("No new articles found")
+                self._record_new_articles(0)
                 return "no_articles"
             
-            # Filter out already sent articles
-            new_articles = [
-                article for article in articles 
-                if article.get('link') not in self.sent_articles
+            # Look up every linked article's link and headline fingerprints (one query
+            # each), then take up to 3 not-yet-sent ones per batch
+            candidates = [
+                (url_key(article.link), _title_key(article.title), article)
+                for article in articles if article.link
             ]
+            sent = await self.sent_articles.seen(key for key, _, _ in candidates)
+            sent_titles = await self.sent_titles.seen(title_key for _, title_key, _ in candidates)
+            batch = list(itertools.islice(
+                (
+                    (key, title_key, article) for key, title_key, article in candidates
+                    if key not in sent and title_key not in sent_titles
+                ),
+                3
+            ))
+            self._record_new_articles(len(batch))
             
-            if not new_articles:
+            if not batch:
                 logger.info("No new articles to process")
                 return "no_new_articles"
-              # Process up to 3 articles per batch
-            articles_processed = 0
-            for article in new_articles[:3]:
-                try:
-                    await self._process_article(article)
-                    self.sent_articles.add(article.get('link'))
-                    articles_processed += 1
-                    # Small delay between articles
-                    await asyncio.sleep(2)
-                except Exception as e:
-                    logger.error(f"Error processing article {article.get('title', 'Unknown')}: {e}")
-                    continue
+            # Generate tweets for the whole batch concurrently, and send each suggestion
+            # as soon as it and every earlier one are ready: sends overlap the remaining
+            # generation, while messages still arrive in the order articles were ranked
+            tasks = [asyncio.ensure_future(self._process_article(article)) for _, _, article in batch]
+            sent_keys = []
+            sent_title_keys = []
+            try:
+                for (key, title_key, article), task in zip(batch, tasks):
+                    try:
+                        message = await task
+                    except Exception as e:
+                        logger.error("Error processing article %s: %s", article.title or 'Unknown', e)
+                        continue
+                    sent_keys.append(key)
+                    sent_title_keys.append(title_key)
+                    if message:
+                        await self._send_suggestion(*message)
+            finally:
+                for task in tasks:
+                    task.cancel()
+            
+            await self.sent_articles.add(sent_keys)
+            await self.sent_titles.add(sent_title_keys)
+            articles_processed = len(sent_keys)
             
             if articles_processed > 0:
-                logger.info(f"Successfully processed {articles_processed} articles")
+                logger.info("Successfully processed %s articles", articles_processed)
                 return "success"
             else:
                 logger.warning("Failed to process any articles")
                 return "error"
         
         except Exception as e:
-            logger.error(f"Error fetching news: {e}")
+            logger.error("Error fetching news: %s", e)
             return "error"
     
-    async def _process_article(self, article: Dict[str, Any]):
-        """Process a single article and send tweet suggestions."""
+    async def _process_article(self, article: Article
+                               ) -> Optional[Tuple[str, List[MessageEntity], InlineKeyboardMarkup]]:
+        """Process a single article and build its tweet suggestion message."""
         try:
-            headline = article.get('title', '')
-            link = article.get('link', '')
+            headline = article.title
+            link = article.link
             # Use full content if available, fallback to summary
-            content = article.get('content', '') or article.get('summary', '')
+            content = article.content or article.summary
             
-            # Generate tweet suggestions with full content for better analysis
-            tweets = await self.text_generator.generate_tweets(headline, content, link)
+            # Reuse tweets for content we've already generated for (syndicated/republished stories)
+            cache_key = hashlib.blake2b(f"{headline}\n{content}".encode(), digest_size=16).digest()
+            tweets = self._tweet_cache.get(cache_key)
+            if tweets is not None:
+                self._tweet_cache.move_to_end(cache_key)
+            else:
+                # Generate tweet suggestions with full content for better analysis
+                tweets = await self.text_generator.generate_tweets(headline, content, link)
+                if tweets:
+                    self._tweet_cache[cache_key] = tweets
+                    if len(self._tweet_cache) > TWEET_CACHE_SIZE:
+                        self._tweet_cache.popitem(last=False)
             
             if not tweets:
-                logger.warning(f"No tweets generated for article: {headline}")
-                return
-              # Send to user
-            await self._send_tweet_suggestions(article, tweets)
+                logger.warning("No tweets generated for article: %s", headline)
+                return None
+            
+            return self._build_tweet_suggestions(
+                article.source or 'Unknown Source', headline, link, tweets
+            )
         
         except Exception as e:
-            logger.error(f"Error processing article: {e}")
+            logger.error("Error processing article: %s", e)
+            return None
     
-    async def _send_tweet_suggestions(self, article: Dict[str, Any], tweets: List[str]):
-        """Send tweet suggestions to user."""
-        headline = article.get('title', '')
-        link = article.get('link', '')
-        source = article.get('source', 'Unknown Source')
+    def _build_tweet_suggestions(self, source: str, headline: str, link: str, tweets: List[str]
+                                 ) -> Tuple[str, List[MessageEntity], InlineKeyboardMarkup]:
+        """Build the tweet suggestions message, its formatting entities and keyboard."""
+        from telegram import MessageEntity
+        
+        # Formatting is sent as entities over plain text, so Telegram doesn't parse
+        # Markdown and article text needs no escaping; offsets are in UTF-16 units
+        parts = []
+        entities = []
+        offset = 0
+        
+        def add(text: str, entity_type: str = None):
+            nonlocal offset
+            length = _utf16_len(text)
+            if entity_type and length:
+                entities.append(MessageEntity(entity_type, offset, length))
+            parts.append(text)
+            offset += length
         
         # Format message with source attribution
-        message_text = f"📰 **New article from {source}**\n\n"
-        message_text += f"**{headline}**\n\n"
+        add("📰 ")
+        add(f"New article from {source}", MessageEntity.BOLD)
+        add("\n\n")
+        add(headline, MessageEntity.BOLD)
+        add("\n\n")
         
         if link:
-            message_text += f"🔗 **Source:** {link}\n\n"
+            add("🔗 ")
+            add("Source:", MessageEntity.BOLD)
+            add(" ")
+            add(link, MessageEntity.URL)
+            add("\n\n")
         
-        message_text += "✍️ **Optimized Tweet Suggestions:**\n\n"
+        add("✍️ ")
+        add("Optimized Tweet Suggestions:", MessageEntity.BOLD)
+        add("\n\n")
         
         # Add numbered tweet options
         for i, tweet in enumerate(tweets, 1):
-            message_text += f"{i}. {tweet}\n\n"
+            add(f"{i}. {tweet}\n\n")
+        message_text = "".join(parts)
         
-        # Store pending tweets data for the user (using owner_id as user_id)
-        user_id = self.config['owner_id']
-        self.pending_tweets[user_id] = {
+        # Store pending tweets under an id of their own, which this message's buttons
+        # carry, so concurrent suggestions never overwrite each other; only the tweets
+        # are needed by the buttons, and ignored suggestions expire
+        self._reap_pending_tweets()
+        suggestion_id = secrets.token_urlsafe(6)
+        self.pending_tweets[suggestion_id] = {
             'tweets': tweets,
-            'article': article
+            'expires': time.monotonic() + PENDING_TWEETS_TTL
         }
         
-        # Create inline keyboard with short callback data
-        keyboard = []
-        for i in range(len(tweets)):
-            keyboard.append([InlineKeyboardButton(
-                f"✅ Post {i+1}", 
-                callback_data=f"t{i+1}"  # Short callback data: "t1", "t2", "t3"
-            )])
-        
-        keyboard.append([InlineKeyboardButton("❌ Skip", callback_data="skip")])
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        # Send message to bot owner
+        reply_markup = _tweet_keyboard(len(tweets), suggestion_id)
+        return message_text, entities, reply_markup
+    
+    async def _send_suggestion(self, message_text: str, entities: List[MessageEntity],
+                               reply_markup: InlineKeyboardMarkup):
+        """Send a tweet suggestions message to the bot owner."""
         try:
             await self.application.bot.send_message(
-                chat_id=self.config['owner_id'],
+                chat_id=self.owner_id,
                 text=message_text,
-                parse_mode='Markdown',
+                entities=entities,
+                parse_mode=None,
                 reply_markup=reply_markup,
                 disable_web_page_preview=True
             )
         except Exception as e:
-            logger.error(f"Error sending message to user: {e}")
+            logger.error("Error sending message to user: %s", e)
     
-    def _schedule_news_fetching(self):
-        """Schedule periodic news fetching."""
-        frequency_hours = self.config['frequency']
-        
-        self.scheduler.add_job(
-            func=self.fetch_and_send_news,
-            trigger="interval",
-            hours=frequency_hours,
-            id=f"news_fetch_{self.bot_id}",
-            replace_existing=True
-        )
+    def _reap_pending_tweets(self):
+        """Drop tweet suggestions whose buttons were never pressed."""
+        now = time.monotonic()
+        expired = [sid for sid, data in self.pending_tweets.items() if data['expires'] < now]
+        for sid in expired:
+            del self.pending_tweets[sid]
+    
+    async def _prune_sent_articles(self):
+        """Forget sent articles older than SENT_ARTICLES_MAX_AGE, at most once a day."""
+        now = datetime.now()
+        if now - self.last_cleanup_time < timedelta(days=1):
+            return
+        self.last_cleanup_time = now
+        removed = await self.sent_articles.prune(SENT_ARTICLES_MAX_AGE)
+        await self.sent_titles.prune(SENT_ARTICLES_MAX_AGE)
+        if removed:
+            logger.info("Pruned %s old sent articles", removed)
+    
+    async def _periodic_fetch(self):
+        """Fetch news every fetch interval until cancelled."""
+        logger.info("Scheduled news fetching every %s hours", self.frequency)
+        # Ticks are laid out from a fixed base so they don't drift by fetch duration
+        base = time.monotonic()
+        while True:
+            base += self._fetch_interval
+            # Jitter each run by up to 10% of the interval so bots restarted together
+            # don't keep hitting the same RSS hosts in lockstep
+            delay = max(0.0, base + random.uniform(0, self._fetch_interval * 0.1) - time.monotonic())
+            next_fetch = datetime.now() + timedelta(seconds=delay)
+            self._next_fetch_text = next_fetch.strftime("%Y-%m-%d %H:%M:%S")
+            await asyncio.sleep(delay)
+            # Expired suggestions are otherwise only reaped when new ones arrive
+            self._reap_pending_tweets()
+            try:
+                await self.fetch_and_send_news()
+            except Exception:
+                logger.exception("Scheduled news fetch failed")
+            # Skip the ticks missed while this fetch ran rather than replaying them
+            base = max(base, time.monotonic() - self._fetch_interval)
+    
+    def _record_new_articles(self, count: int):
+        """Track how many new articles a fetch found and adapt the fetch interval."""
+        recent = self._recent_new_counts
+        recent.append(count)
+        if len(recent) < 3:
+            return
         
-        logger.info(f"Scheduled news fetching every {frequency_hours} hours")
+        # Back off on quiet feeds, and come back towards the configured frequency
+        # (never faster than it) when every fetch fills a batch
+        configured = self.frequency * 3600
+        mean = sum(recent) / len(recent)
+        if mean < 0.2:
+            interval = min(self._fetch_interval * 2, max(MAX_FETCH_INTERVAL, configured))
+        elif mean > 2.5:
+            interval = max(self._fetch_interval // 2, configured)
+        else:
+            return
+        if interval == self._fetch_interval:
+            return
+        
+        # Takes effect from the next scheduled fetch; judge it on its own fetches
+        self._fetch_interval = interval
+        recent.clear()
+        logger.info("Adjusted news fetching interval to %s minutes", interval // 60)
     
     async def start(self):
         """Start the news bot."""
-        logger.info(f"Starting news bot: {self.config['name']}")
+        logger.info("Starting news bot: %s", self.name)
         
         # Initialize application
         await self.application.initialize()
         await self.application.start()
         await self.application.updater.start_polling()
         
-        # Start scheduler
-        self.scheduler.start()
-        self._schedule_news_fetching()
+        # Start periodic fetching
+        self._fetch_task = asyncio.create_task(self._periodic_fetch())
         
-        # Send initial news check
-        await asyncio.sleep(5)  # Wait a bit for bot to be ready
+        # Send initial news check once the Bot API is confirmed reachable
+        try:
+            await self.application.bot.get_me()
+        except Exception as e:
+            logger.warning("Bot API readiness check failed: %s", e)
         await self.fetch_and_send_news()
         
         try:
@@ -376,7 +606,16 @@ I'll start sending you news updates automatically!
         except KeyboardInterrupt:
             logger.info("Received interrupt signal")
         finally:
-            self.scheduler.shutdown()
+            # Let a fetch in progress unwind before closing what it uses
+            self._fetch_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._fetch_task
+            if self._x_poster is not None:
+                self._x_poster.close()
+            self.sent_articles.close()
+            self.sent_titles.close()
+            self.rss_fetcher.close()
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
             await self.application.updater.stop()
             await self.application.stop()
             await self.application.shutdown()
@@ -384,7 +623,7 @@ I'll start sending you news updates automatically!
 async def main():
     """Main function for running individual bot."""
     if len(sys.argv) < 2:
-        print("Usage: python -m bots.news_bot <bot_id>")
+        logger.error("Usage: python -m bots.news_bot <bot_id>")
         sys.exit(1)
     
     bot_id = sys.argv[1]
@@ -394,7 +633,7 @@ async def main():
     config = config_manager.get_bot(bot_id)
     
     if not config:
-        print(f"Bot configuration not found for ID: {bot_id}")
+        logger.error("Bot configuration not found for ID: %s", bot_id)
         sys.exit(1)
     
     # Create and start bot
@@ -402,8 +641,15 @@ async def main():
     await bot.start()
 
 if __name__ == "__main__":
-    logging.basicConfig(
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        level=logging.INFO
-    )
-    asyncio.run(main())
+    # Bot tasks only enqueue log records; a listener thread does the writes, so a
+    # slow log file or pipe never blocks the event loop
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(log_queue)])
+    log_listener.start()
+    try:
+        asyncio.run(main())
+    finally:
+        log_listener.stop()
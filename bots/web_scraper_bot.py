@@ -7,17 +7,35 @@ import logging
 import os
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
+from operator import itemgetter
 
 from .base_bot import BaseBot
-from utils.web_scraper import WebScraper
-from utils.text_generator import TextGenerator
+from utils.web_scraper import WebScraper, compile_keywords, create_session
+from utils.text_generator import get_text_generator
+from utils.dedup_store import DedupStore
+from utils.url_lru import url_key
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of websites scraped at the same time
+MAX_CONCURRENT_SCRAPES = 8
+
+# Seconds a processed article URL is remembered for deduplication
+PROCESSED_URLS_MAX_AGE = 30 * 24 * 3600
+
+# Seconds each website gets to respond during test_connection
+TEST_SCRAPE_TIMEOUT = 10.0
+
 class WebScraperBot(BaseBot):
     """Web Scraper Bot for monitoring websites and generating tweets."""
     
+    __slots__ = (
+        'scraper_config', 'websites', 'keywords', 'content_filters', 'last_scrape_time', '_last_scrape_text',
+        'web_scraper', 'text_generator', 'processed_urls', 'last_cleanup_time', '_keyword_pattern',
+        '_source_names', '_http',
+    )
+    
     def __init__(self, bot_config: Dict[str, Any]):
         """Initialize Web Scraper bot with configuration."""
         super().__init__(bot_config)
@@ -26,102 +44,212 @@ class WebScraperBot(BaseBot):
         self.scraper_config = bot_config.get("scraper_config", {})
         self.websites = self.scraper_config.get("websites", [])
         self.keywords = self.scraper_config.get("keywords", [])
+        self._keyword_pattern = compile_keywords(self.keywords)
         self.content_filters = self.scraper_config.get("content_filters", {})
-        self.last_scrape_time = datetime.now() - timedelta(hours=24)
+        # Display name per website URL, resolved once rather than on every scrape cycle
+        self._source_names = {
+            website.get("url", ""): website.get("name") or urlparse(website.get("url", "")).netloc
+            for website in self.websites
+        }
+        self._set_last_scrape_time(datetime.now() - timedelta(hours=24))
         
-        # Initialize web scraper
-        self.web_scraper = WebScraper()
+        # Initialize web scraper on one pooled session kept for the bot's lifetime,
+        # so every site's keep-alive connection is reused across scrape cycles
+        self._http = create_session(
+            max_hosts=max(len(self.websites), 10),
+            max_per_host=MAX_CONCURRENT_SCRAPES
+        )
+        self.web_scraper = WebScraper(session=self._http)
         
         # Initialize text generator
-        self.text_generator = TextGenerator()
+        self.text_generator = get_text_generator()
         
-        # Processed content tracking
-        self.processed_urls = set()
+        # Processed content tracking, persisted in the shared SQLite dedup store
+        self.processed_urls = DedupStore(f"web_scraper_{self.bot_id}")
+        self.last_cleanup_time = datetime.now()
         
-        logger.info(f"Web Scraper Bot initialized for {len(self.websites)} websites")
+        logger.info("Web Scraper Bot initialized for %s websites", len(self.websites))
     
     def get_bot_type(self) -> str:
         """Return the bot type identifier."""
         return "web_scraper"
     
+    async def stop(self):
+        """Stop the bot and close its HTTP connections and dedup store."""
+        await super().stop()
+        self._http.close()
+        self.processed_urls.close()
+    
     async def fetch_content(self) -> List[Dict[str, Any]]:
         """Fetch new articles from configured websites."""
         try:
             if not self.websites:
-                logger.warning(f"No websites configured for bot {self.name}")
+                logger.warning("No websites configured for bot %s", self.name)
                 return []
             
-            all_content = []
+            # Scrape all websites concurrently, a bounded number at a time
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+            results = await asyncio.gather(
+                *(self._scrape_one(website_config, semaphore) for website_config in self.websites),
+                return_exceptions=True
+            )
             
-            # Scrape each configured website
-            for website_config in self.websites:
-                try:
-                    url = website_config.get("url", "")
-                    if not url:
-                        logger.warning(f"No URL configured for website config: {website_config}")
-                        continue
-                    
-                    logger.info(f"Scraping website: {url}")
-                    
-                    # Create scrape configuration
-                    scrape_config = {
-                        "method": website_config.get("method", "html"),
-                        "selectors": website_config.get("selectors", {}),
-                        "filters": {
-                            "keywords": self.keywords,
-                            "min_content_length": self.content_filters.get("min_content_length", 100),
-                            "max_age_hours": self.content_filters.get("max_age_hours", 24),
-                            **website_config.get("filters", {})
-                        },
-                        "rate_limit": website_config.get("rate_limit", 1.0)
-                    }
-                    
-                    # Scrape the website
-                    articles = await self.web_scraper.scrape_website(url, scrape_config)
-                    
-                    # Filter out already processed articles
-                    new_articles = [
-                        article for article in articles 
-                        if article.get('url') not in self.processed_urls
-                    ]
-                    
-                    # Add website source info
-                    for article in new_articles:
-                        article['source_website'] = url
-                        article['source_name'] = website_config.get("name", urlparse(url).netloc)
-                        self.processed_urls.add(article.get('url'))
-                    
-                    all_content.extend(new_articles)
-                    logger.info(f"Found {len(new_articles)} new articles from {url}")
-                    
-                except Exception as e:
-                    logger.error(f"Error scraping website {website_config.get('url', 'unknown')}: {str(e)}")
+            # Fingerprint every scraped URL so they can all be looked up in one query
+            keyed_results = []
+            for website_config, result in zip(self.websites, results):
+                if isinstance(result, Exception):
+                    logger.error("Error scraping website %s: %s", website_config.get('url') or 'unknown', result)
                     continue
+                keyed_results.append((website_config, [
+                    (url_key(article_url), article) for article in result
+                    if (article_url := article.get('link'))
+                ]))
+            seen = await self.processed_urls.seen(key for _, keyed in keyed_results for key, _ in keyed)
+            
+            # Deduplicate and tag in a single pass once all scrapes are done
+            all_content = []
+            new_keys = []
+            for website_config, keyed in keyed_results:
+                url = website_config.get("url", "")
+                source_name = self._source_names[url]
+                
+                # Skip already processed articles (including repeats across sites)
+                # and tag the new ones with their website in the same pass
+                new_count = 0
+                for key, article in keyed:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    new_keys.append(key)
+                    article['source_website'] = url
+                    article['source_name'] = source_name
+                    all_content.append(article)
+                    new_count += 1
+                
+                logger.info("Found %s new articles from %s", new_count, url)
+            
+            await self.processed_urls.add(new_keys)
+            await self._prune_processed_urls()
             
             # Update last scrape time
-            self.last_scrape_time = datetime.now()
+            self._set_last_scrape_time(datetime.now())
             
-            # Sort by publication date (newest first)
-            all_content.sort(key=lambda x: x.get('date', datetime.min), reverse=True)
+            # Sort by publication date (newest first); keys are read once up front and
+            # compared by itemgetter so the sort makes no per-comparison Python calls
+            decorated = [(article.get('published_date') or datetime.min, article) for article in all_content]
+            decorated.sort(key=itemgetter(0), reverse=True)
+            all_content = [article for _, article in decorated]
             
-            logger.info(f"Web Scraper bot {self.name} found {len(all_content)} new articles total")
+            logger.info("Web Scraper bot %s found %s new articles total", self.name, len(all_content))
             return all_content
             
         except Exception as e:
-            logger.error(f"Error in Web Scraper bot {self.name} fetch_content: {str(e)}")
+            logger.error("Error in Web Scraper bot %s fetch_content: %s", self.name, e)
+            return []
+    
+    async def _prune_processed_urls(self):
+        """Forget processed URLs older than PROCESSED_URLS_MAX_AGE, at most once a day."""
+        now = datetime.now()
+        if now - self.last_cleanup_time < timedelta(days=1):
+            return
+        self.last_cleanup_time = now
+        removed = await self.processed_urls.prune(PROCESSED_URLS_MAX_AGE)
+        if removed:
+            logger.info("Pruned %s old processed URLs", removed)
+    
+    def _set_last_scrape_time(self, when: datetime):
+        """Record the last scrape time, formatting it once for status replies."""
+        self.last_scrape_time = when
+        self._last_scrape_text = when.strftime("%Y-%m-%d %H:%M:%S")
+    
+    async def _scrape_one(self, website_config: Dict[str, Any],
+                          semaphore: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        """Scrape a single configured website."""
+        url = website_config.get("url", "")
+        if not url:
+            logger.warning("No URL configured for website config: %s", website_config)
             return []
+        
+        # Create scrape configuration
+        scrape_config = {
+            "method": website_config.get("method", "html"),
+            "selectors": website_config.get("selectors", {}),
+            "filters": {
+                "keywords": self.keywords,
+                "min_content_length": self.content_filters.get("min_content_length", 100),
+                "max_age_hours": self.content_filters.get("max_age_hours", 24),
+                **website_config.get("filters", {})
+            },
+            "rate_limit": website_config.get("rate_limit", 1.0)
+        }
+        # Share the bot-wide keyword pattern unless this site overrides the keywords
+        filters = scrape_config["filters"]
+        filters["keyword_pattern"] = (
+            self._keyword_pattern if filters["keywords"] is self.keywords
+            else compile_keywords(filters["keywords"])
+        )
+        
+        async with semaphore:
+            logger.info("Scraping website: %s", url)
+            return await self.web_scraper.scrape_website(url, scrape_config)
+    
+    async def _test_one(self, website_config: Dict[str, Any],
+                        semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Test-scrape a single website and report the outcome."""
+        url = website_config.get("url", "")
+        method = website_config.get("method", "html")
+        try:
+            # Create minimal scrape config for testing
+            scrape_config = {
+                "method": method,
+                "selectors": website_config.get("selectors", {}),
+                "filters": {
+                    "max_age_hours": 168,  # 1 week for testing
+                    "min_content_length": 50
+                },
+                "rate_limit": 2.0  # Slower for testing
+            }
+            
+            # Test scrape
+            async with semaphore:
+                articles = await asyncio.wait_for(
+                    self.web_scraper.scrape_website(url, scrape_config),
+                    timeout=TEST_SCRAPE_TIMEOUT
+                )
+            
+            return {
+                "url": url,
+                "success": True,
+                "articles_found": len(articles),
+                "method": method
+            }
+            
+        except asyncio.TimeoutError:
+            return {
+                "url": url,
+                "success": False,
+                "error": f"Timed out after {TEST_SCRAPE_TIMEOUT:g}s",
+                "method": method
+            }
+        except Exception as e:
+            return {
+                "url": url,
+                "success": False,
+                "error": str(e),
+                "method": method
+            }
     
     async def process_content(self, content: Dict[str, Any]) -> Optional[str]:
         """Process scraped content and generate tweet text."""
         try:
             # Extract key information
             title = content.get('title', '').strip()
-            url = content.get('url', '')
+            url = content.get('link', '')
             source_name = content.get('source_name', 'Web')
             article_content = content.get('content', '').strip()
             
             if not title or not url:
-                logger.warning(f"Missing title or URL in content: {content}")
+                logger.warning("Missing title or URL in content: %s", content)
                 return None
             
             # Prepare content for text generation
@@ -137,14 +265,14 @@ class WebScraperBot(BaseBot):
             tweet_text = await self.text_generator.generate_tweet(processed_content)
             
             if tweet_text:
-                logger.info(f"Generated tweet for article: {title[:50]}...")
+                logger.info("Generated tweet for article: %s...", title[:50])
                 return tweet_text
             else:
-                logger.warning(f"Failed to generate tweet for article: {title}")
+                logger.warning("Failed to generate tweet for article: %s", title)
                 return None
                 
         except Exception as e:
-            logger.error(f"Error processing content in Web Scraper bot {self.name}: {str(e)}")
+            logger.error("Error processing content in Web Scraper bot %s: %s", self.name, e)
             return None
     
     async def get_status_info(self) -> Dict[str, Any]:
@@ -156,13 +284,13 @@ class WebScraperBot(BaseBot):
                 "running": self.running,
                 "websites_count": len(self.websites),
                 "keywords_count": len(self.keywords),
-                "processed_urls_count": len(self.processed_urls),
-                "last_scrape": self.last_scrape_time.strftime("%Y-%m-%d %H:%M:%S") if self.last_scrape_time else "Never",
+                "processed_urls_count": await self.processed_urls.count(),
+                "last_scrape": self._last_scrape_text,
                 "frequency": f"{self.frequency} hours",
                 "auto_post": self.auto_post
             }
         except Exception as e:
-            logger.error(f"Error getting status info for Web Scraper bot {self.name}: {str(e)}")
+            logger.error("Error getting status info for Web Scraper bot %s: %s", self.name, e)
             return {}
     
     async def get_configuration_summary(self) -> str:
@@ -190,13 +318,13 @@ class WebScraperBot(BaseBot):
                 summary += f"  {keyword_list}\n"
             
             summary += f"\n📈 *Stats:*\n"
-            summary += f"  • Processed URLs: {len(self.processed_urls)}\n"
-            summary += f"  • Last scrape: {self.last_scrape_time.strftime('%Y-%m-%d %H:%M') if self.last_scrape_time else 'Never'}\n"
+            summary += f"  • Processed URLs: {await self.processed_urls.count()}\n"
+            summary += f"  • Last scrape: {self._last_scrape_text[:16]}\n"  # Minutes precision
             
             return summary
             
         except Exception as e:
-            logger.error(f"Error generating configuration summary for Web Scraper bot {self.name}: {str(e)}")
+            logger.error("Error generating configuration summary for Web Scraper bot %s: %s", self.name, e)
             return f"Error generating summary for {self.name}"
     
     async def test_connection(self) -> Dict[str, Any]:
@@ -209,41 +337,12 @@ class WebScraperBot(BaseBot):
                     "details": {}
                 }
             
-            test_results = []
-            
-            # Test first website only for quick test
-            website_config = self.websites[0]
-            url = website_config.get("url", "")
-            
-            try:
-                # Create minimal scrape config for testing
-                scrape_config = {
-                    "method": website_config.get("method", "html"),
-                    "selectors": website_config.get("selectors", {}),
-                    "filters": {
-                        "max_age_hours": 168,  # 1 week for testing
-                        "min_content_length": 50
-                    },
-                    "rate_limit": 2.0  # Slower for testing
-                }
-                
-                # Test scrape
-                articles = await self.web_scraper.scrape_website(url, scrape_config)
-                
-                test_results.append({
-                    "url": url,
-                    "success": True,
-                    "articles_found": len(articles),
-                    "method": scrape_config["method"]
-                })
-                
-            except Exception as e:
-                test_results.append({
-                    "url": url,
-                    "success": False,
-                    "error": str(e),
-                    "method": website_config.get("method", "html")
-                })
+            # Probe every website concurrently, each under its own timeout, so one
+            # hanging or broken site neither hides nor delays the others
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+            test_results = await asyncio.gather(
+                *(self._test_one(website_config, semaphore) for website_config in self.websites)
+            )
             
             success = any(result["success"] for result in test_results)
             
@@ -257,7 +356,7 @@ class WebScraperBot(BaseBot):
             }
             
         except Exception as e:
-            logger.error(f"Error testing Web Scraper bot connection: {str(e)}")
+            logger.error("Error testing Web Scraper bot connection: %s", e)
             return {
                 "success": False,
                 "message": f"Test failed: {str(e)}",
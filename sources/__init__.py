@@ -2,6 +2,6 @@
 Sources package initialization.
 """
 
-from .rss_fetcher import RSSFetcher
+from .rss_fetcher import Article, RSSFetcher
 
-__all__ = ['RSSFetcher']
+__all__ = ['Article', 'RSSFetcher']
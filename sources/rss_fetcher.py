@@ -3,161 +3,556 @@ RSS feed fetcher for different news sources and niches.
 """
 
 import asyncio
+import calendar
+import heapq
+import importlib.util
+import io
+import logging
+import re
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Executor
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
 import feedparser
 import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
-import logging
+import soupsieve
 from bs4 import BeautifulSoup
-import re
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.html_parser import HTML_PARSER
+
+# Optional main-text extractor; without it pages go through the selector heuristics below
+try:
+    import trafilatura
+except ImportError:
+    trafilatura = None
 
 logger = logging.getLogger(__name__)
 
+# Article pages are read up to this many (decompressed) bytes; the main content
+# sits well within it, and the rest is mostly scripts, footers and comments
+MAX_ARTICLE_BYTES = 1_000_000
+
+# urllib3 decodes brotli (smaller than gzip on most news sites) when a brotli module is installed
+_ACCEPT_ENCODING = (
+    'gzip, deflate, br'
+    if importlib.util.find_spec('brotli') or importlib.util.find_spec('brotlicffi')
+    else 'gzip, deflate'
+)
+
+# Selectors for an article page's main content, in priority order; compiled once,
+# plus their union so candidates are found in a single walk of the page
+_CONTENT_SELECTORS = (
+    'article',
+    '[role="main"]',
+    '.post-content',
+    '.article-content',
+    '.entry-content',
+    '.content',
+    '.story-body',
+    '.article-body',
+    '.post-body',
+    'main',
+    '.main-content',
+    '#content',
+    '.article-text',
+)
+_CONTENT_MATCHERS = tuple(soupsieve.compile(selector) for selector in _CONTENT_SELECTORS)
+_CONTENT_UNION = soupsieve.compile(", ".join(_CONTENT_SELECTORS))
+
+# Text cleanup patterns, compiled once
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+# Footer/navigation boilerplate: everything from the first match on is dropped
+_FOOTER_RE = re.compile(
+    r'(?:subscribe to our newsletter|sign up for.*newsletter|follow us on|share this article'
+    r'|related articles|recommended for you|advertisement).*',
+    re.IGNORECASE
+)
+
+# Root element of the feed formats the streaming parser understands, found in the
+# first bytes of the payload (after the XML declaration, comments or a doctype)
+_FEED_ROOT_RE = re.compile(rb'<(rss|feed|rdf:RDF)[\s>]')
+_FEED_PREFIX_SIZE = 512
+
+# Feed type -> (element holding the feed title, element of each article)
+_FEED_LAYOUTS = {
+    b'rss': ('channel', 'item'),
+    b'rdf:RDF': ('channel', 'item'),
+    b'feed': ('feed', 'entry'),
+}
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from an element tag."""
+    return tag.rpartition('}')[2]
+
+def _parse_date(value: str) -> Optional[datetime]:
+    """Parse an RFC 822 (RSS) or ISO 8601 (Atom) date into an aware datetime."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    # Dates without an offset are taken as UTC
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+def _entry_fields(item: ET.Element) -> Dict[str, Any]:
+    """Extract the fields RSSFetcher uses from an RSS <item> or Atom <entry>."""
+    fields = {}
+    link = ''
+    for child in item:
+        name = _local_name(child.tag)
+        if name == 'link':
+            href = child.get('href')
+            if href is None:
+                # RSS: the link is the element text
+                link = link or (child.text or '').strip()
+            elif child.get('rel', 'alternate') == 'alternate':
+                # Atom: only the alternate link points at the article page
+                link = link or href
+        elif name == 'guid' and child.get('isPermaLink', 'true') == 'true':
+            fields.setdefault('permalink', (child.text or '').strip())
+        else:
+            fields.setdefault(name, ''.join(child.itertext()).strip())
+    
+    published = fields.get('pubDate') or fields.get('published') or fields.get('date') or ''
+    updated = fields.get('updated') or fields.get('modified')
+    return {
+        'title': fields.get('title', ''),
+        'link': link or fields.get('permalink', ''),
+        'summary': (fields.get('description') or fields.get('summary')
+                    or fields.get('content') or fields.get('encoded') or ''),
+        'published': published,
+        'published_time': _parse_date(published) or _parse_date(updated),
+    }
+
+def _detect_feed_type(content: bytes) -> Optional[bytes]:
+    """Sniff the feed type (b'rss', b'rdf:RDF' or b'feed') from the payload's first bytes."""
+    match = _FEED_ROOT_RE.search(content, 0, _FEED_PREFIX_SIZE)
+    return match.group(1) if match else None
+
+def _parse_feed_xml(content: bytes, title_parent: str, item_tag: str) -> Dict[str, Any]:
+    """Stream-parse a well-formed feed whose layout is already known."""
+    feed_title = None
+    entries = []
+    path = []
+    for event, elem in ET.iterparse(io.BytesIO(content), events=('start', 'end')):
+        if event == 'start':
+            path.append(_local_name(elem.tag))
+            continue
+        
+        name = path.pop()
+        if name == item_tag:
+            entries.append(_entry_fields(elem))
+            # Entries are done with once extracted, so drop their subtrees right away
+            elem.clear()
+        elif name == 'title' and feed_title is None and path and path[-1] == title_parent:
+            feed_title = (elem.text or '').strip()
+    
+    return {'title': feed_title, 'bozo_exception': None, 'entries': entries}
+
+def parse_feed(content: bytes) -> Dict[str, Any]:
+    """Parse raw feed bytes into plain, picklable data.
+    
+    Runs in an executor (possibly a worker process), so it only returns the
+    fields RSSFetcher uses, as builtin types. The feed type is sniffed up front and
+    well-formed RSS and Atom feeds are stream-parsed with ElementTree; anything
+    else goes through feedparser, which copes with malformed markup but is much slower.
+    """
+    feed_type = _detect_feed_type(content)
+    if feed_type is not None:
+        try:
+            return _parse_feed_xml(content, *_FEED_LAYOUTS[feed_type])
+        except ET.ParseError:
+            pass
+    
+    feed = feedparser.parse(content)
+    
+    def entry_time(entry) -> Optional[datetime]:
+        # Prefer the raw dates; feedparser's parsed UTC tuples cover formats _parse_date doesn't
+        parsed = _parse_date(entry.get('published')) or _parse_date(entry.get('updated'))
+        if parsed is None:
+            struct = entry.get('published_parsed') or entry.get('updated_parsed')
+            if struct:
+                parsed = datetime.fromtimestamp(calendar.timegm(struct), timezone.utc)
+        return parsed
+    
+    return {
+        'title': feed.feed.get('title'),
+        'bozo_exception': str(feed.get('bozo_exception')) if feed.bozo else None,
+        'entries': [
+            {
+                'title': entry.get('title', ''),
+                'link': entry.get('link', ''),
+                'summary': entry.get('summary', ''),
+                'published': entry.get('published', ''),
+                'published_time': entry_time(entry),
+            }
+            for entry in feed.entries
+        ]
+    }
+
+def extract_article_text(html: bytes, article_url: str) -> str:
+    """Extract the main text of an article page ('' if none is found).
+    
+    CPU-bound, so it runs in RSSFetcher's parse executor (possibly a worker
+    process) alongside feed parsing.
+    """
+    # Prefer trafilatura's boilerplate-aware extraction when it's installed;
+    # it already drops navigation, footers and comments
+    if trafilatura is not None:
+        text = trafilatura.extract(html, url=article_url,
+                                   include_comments=False, favor_precision=True)
+        if text:
+            if len(text) > 8000:  # Reasonable limit for GPT processing
+                text = text[:8000] + "..."
+            logger.debug(f"Extracted {len(text)} characters from {article_url}")
+            return text
+    
+    # Parse HTML content
+    soup = BeautifulSoup(html, HTML_PARSER)
+    
+    # Remove unwanted elements
+    for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'advertisement']):
+        element.decompose()
+    
+    # Try to find the main article content using common selectors: collect
+    # every candidate in one pass, keep those of the highest-priority selector
+    # that matched anything
+    article_content = None
+    candidates = _CONTENT_UNION.select(soup)
+    if candidates:
+        ranked = [
+            (next(i for i, matcher in enumerate(_CONTENT_MATCHERS) if matcher.match(element)), element)
+            for element in candidates
+        ]
+        best_rank = min(rank for rank, _ in ranked)
+        elements = [element for rank, element in ranked if rank == best_rank]
+        # Get the largest element (likely the main content)
+        article_content = max(elements, key=lambda x: len(x.get_text()))
+    
+    # If no specific content area found, try to extract paragraphs
+    if not article_content:
+        paragraphs = soup.find_all('p')
+        if len(paragraphs) >= 3:  # Ensure it's substantial content
+            article_content = soup
+    
+    if article_content:
+        # Extract text and clean it
+        text = article_content.get_text()
+    
+        # Clean up the text: collapse all whitespace (newlines included) to single spaces
+        text = _WS_RE.sub(' ', text).strip()
+    
+        # Remove common footer text and navigation elements in one pass
+        text = _FOOTER_RE.sub('', text)
+    
+        # Limit content length to avoid token limits
+        if len(text) > 8000:  # Reasonable limit for GPT processing
+            text = text[:8000] + "..."
+    
+        logger.debug(f"Extracted {len(text)} characters from {article_url}")
+        return text
+    
+    logger.warning(f"Could not extract content from {article_url}")
+    return ""
+
+@dataclass(frozen=True, slots=True)
+class Article:
+    """A feed article, with the page's full text (or the summary) as content."""
+    title: str
+    link: str
+    summary: str
+    content: str
+    published: str
+    published_time: Optional[datetime]
+    source: str
+    source_url: str
+
+# Sort key for articles without a publication date (oldest possible)
+_NO_DATE = datetime.min.replace(tzinfo=timezone.utc)
+
+# Maximum number of feeds downloaded at the same time
+MAX_CONCURRENT_FEEDS = 8
+
+# Maximum number of article pages downloaded from one host at the same time
+MAX_CONCURRENT_PER_HOST = 5
+
+# Requests per second (and burst size) allowed to any one host; different hosts
+# are not throttled against each other
+HOST_REQUEST_RATE = 2.0
+HOST_REQUEST_BURST = 2
+
+class _TokenBucket:
+    """Async token bucket pacing requests to `rate` per second, in bursts of up to `burst`."""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request may be made, then take its token."""
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                # Waiters queue on the lock, so each sleeps for exactly its own token
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 1.0
+                self._updated = time.monotonic()
+            self._tokens -= 1
+
+# Number of extracted article texts kept, by URL, across fetches
+ARTICLE_CACHE_SIZE = 2000
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = frozenset({'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'cmpid'})
+
+def _canonical_url(url: str) -> str:
+    """Normalize an article URL so syndicated copies of one link compare equal."""
+    parts = urlsplit(url)
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.startswith('utm_') and key not in _TRACKING_PARAMS
+    ]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ''))
+
+# Titles whose character shingle sets overlap at least this much (Jaccard) are duplicates
+TITLE_SIMILARITY_THRESHOLD = 0.7
+_SHINGLE_SIZE = 5
+
+def _title_shingles(title: str) -> frozenset:
+    """Character shingles of a normalized title (the whole title if it's shorter)."""
+    title = " ".join(title.lower().split())
+    if len(title) <= _SHINGLE_SIZE:
+        return frozenset((title,)) if title else frozenset()
+    return frozenset(title[i:i + _SHINGLE_SIZE] for i in range(len(title) - _SHINGLE_SIZE + 1))
+
 class RSSFetcher:
     """Fetches news from RSS feeds for specific niches."""
     
     # Default RSS feeds for different niches
     DEFAULT_SOURCES = {
-        'tech': [
+        'tech': (
             'https://feeds.feedburner.com/TechCrunch',
             'https://www.theverge.com/rss/index.xml',
             'https://feeds.arstechnica.com/arstechnica/index',
             'https://www.wired.com/feed/rss',
-        ],
-        'crypto': [
+        ),
+        'crypto': (
             'https://coindesk.com/arc/outboundfeeds/rss/',
             'https://cointelegraph.com/rss',
             'https://decrypt.co/feed',
             'https://bitcoinmagazine.com/.rss/full/',
-        ],
-        'ai': [
+        ),
+        'ai': (
             'https://venturebeat.com/category/ai/feed/',
             'https://www.artificialintelligence-news.com/feed/',
             'https://syncedreview.com/feed/',
-        ],        'general': [
+        ),
+        'general': (
             'https://feeds.bbci.co.uk/news/rss.xml',
             'https://feeds.npr.org/1001/rss.xml',
-        ]
+        ),
     }
     
-    def __init__(self, niche: str, custom_sources: List[str] = None):
-        """Initialize RSS fetcher for a specific niche."""
+    def __init__(self, niche: str, custom_sources: List[str] = None,
+                 parse_executor: Optional[Executor] = None):
+        """Initialize RSS fetcher for a specific niche.
+        
+        Feeds are parsed on parse_executor (the event loop's default thread pool
+        if None) so parsing never blocks the event loop.
+        """
         self.niche = niche.lower()
+        self.parse_executor = parse_executor
         self.custom_sources = custom_sources or []
+        # Resolved once; a tuple so callers can't change it by accident
         self.sources = self._get_sources()
         self.last_fetch_time = None
+        # One pooled session for feeds and article pages, so repeat hosts reuse
+        # keep-alive connections; connect/read failures are retried by urllib3
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16, pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.5)
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # Per-host limits on concurrent article page downloads
+        self._host_semaphores = defaultdict(lambda: asyncio.Semaphore(MAX_CONCURRENT_PER_HOST))
+        # Per-host request pacing for feeds and article pages alike
+        self._host_limits = defaultdict(lambda: _TokenBucket(HOST_REQUEST_RATE, HOST_REQUEST_BURST))
+        # Articles from each feed's last full download, served again on 304 Not Modified,
+        # and the [etag, last_modified] validators that download came with
+        self._feed_articles = {}
+        self._feed_validators = {}
+        # Extracted article texts by canonical URL (LRU), so pages that stay in a feed
+        # across fetches are only downloaded and parsed once, and the downloads in
+        # progress, so feeds listing the same link concurrently share one
+        self._content_cache = OrderedDict()
+        self._content_fetches = {}
     
-    def _get_sources(self) -> List[str]:
+    def _get_sources(self) -> Tuple[str, ...]:
         """Get RSS sources for the niche."""
         if self.custom_sources:
-            return self.custom_sources
+            return tuple(self.custom_sources)
         
         return self.DEFAULT_SOURCES.get(self.niche, self.DEFAULT_SOURCES['general'])
     
-    async def fetch_latest_articles(self, hours_back: int = 24) -> List[Dict[str, Any]]:
+    async def fetch_latest_articles(self, hours_back: int = 24) -> List[Article]:
         """Fetch latest articles from all sources."""
         all_articles = []
-        cutoff_time = datetime.now() - timedelta(hours=hours_back)
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours_back)
         
         logger.info(f"Fetching articles from {len(self.sources)} sources for niche: {self.niche}")
         logger.info(f"Looking for articles newer than: {cutoff_time}")
         
-        for source_url in self.sources:
-            try:
-                articles = await self._fetch_from_source(source_url, cutoff_time)
-                all_articles.extend(articles)
-                logger.info(f"Fetched {len(articles)} articles from {source_url}")
-                await asyncio.sleep(0.5)  # Rate limiting
-            except Exception as e:
-                logger.error(f"Error fetching from {source_url}: {e}")
+        # Fetch all feeds concurrently, a bounded number at a time; feeds are on
+        # different hosts, so this replaces the old fixed delay between sources
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FEEDS)
+        
+        async def fetch(source_url: str) -> List[Article]:
+            async with semaphore:
+                return await self._fetch_from_source(source_url, cutoff_time)
+        
+        results = await asyncio.gather(
+            *(fetch(source_url) for source_url in self.sources),
+            return_exceptions=True
+        )
+        for source_url, articles in zip(self.sources, results):
+            if isinstance(articles, Exception):
+                logger.error(f"Error fetching from {source_url}: {articles}")
                 continue
+            all_articles.extend(articles)
+            logger.info(f"Fetched {len(articles)} articles from {source_url}")
         
         logger.info(f"Total articles fetched: {len(all_articles)}")
         
-        # Remove duplicates and sort by publication date
+        # Remove duplicates
         unique_articles = self._deduplicate_articles(all_articles)
-        sorted_articles = sorted(
-            unique_articles, 
-            key=lambda x: x.get('published_parsed', datetime.min.timetuple()),
-            reverse=True
-        )
         
-        logger.info(f"After deduplication and sorting: {len(sorted_articles)} articles")
+        logger.info(f"After deduplication: {len(unique_articles)} articles")
         
         self.last_fetch_time = datetime.now()
-        final_articles = sorted_articles[:10]  # Return top 10 latest articles
+        # Return top 10 latest articles; selecting them doesn't need a full sort
+        latest_articles = heapq.nlargest(
+            10, unique_articles, key=lambda x: x.published_time or _NO_DATE
+        )
+        
+        # Only now fetch full article pages, so none are downloaded for entries that
+        # turn out to be duplicates or aren't among the latest (throttled per host)
+        contents = await asyncio.gather(
+            *(self._article_content(article.link, article.title, article.summary)
+              for article in latest_articles)
+        )
+        final_articles = [
+            replace(article, content=content)
+            for article, content in zip(latest_articles, contents)
+        ]
         
         logger.info(f"Returning {len(final_articles)} latest articles")
         return final_articles
     
-    async def _fetch_from_source(self, source_url: str, cutoff_time: datetime) -> List[Dict[str, Any]]:
+    async def _fetch_from_source(self, source_url: str, cutoff_time: datetime) -> List[Article]:
         """Fetch articles from a single RSS source."""
         try:
-            # Use requests to fetch feed with timeout and retries
-            max_retries = 2
-            for attempt in range(max_retries):
-                try:
-                    response = requests.get(source_url, timeout=8, headers={
-                        'User-Agent': 'News Tweet Bot/1.0'
-                    })
-                    response.raise_for_status()
-                    break
-                except (requests.Timeout, requests.ConnectionError) as e:
-                    if attempt == max_retries - 1:
-                        raise e
-                    logger.warning(f"Retry {attempt + 1} for {source_url}: {e}")
-                    await asyncio.sleep(1)  # Brief pause before retry
+            headers = {'User-Agent': 'News Tweet Bot/1.0'}
+            # Revalidate feeds whose last download this process still holds
+            if source_url in self._feed_validators:
+                etag, last_modified = self._feed_validators[source_url]
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
             
-            # Parse feed
-            feed = feedparser.parse(response.content)
+            # Fetch feed with timeout; the session retries failed connections
+            await self._host_limits[urlsplit(source_url).netloc].acquire()
+            response = await asyncio.to_thread(
+                self._session.get, source_url, timeout=8, headers=headers
+            )
+            response.raise_for_status()
             
-            if feed.bozo:
-                logger.warning(f"Feed parsing issues for {source_url}: {feed.bozo_exception}")
+            # Feed unchanged since the last poll: reuse what was parsed then
+            if response.status_code == 304:
+                logger.debug(f"Feed not modified: {source_url}")
+                return [
+                    article for article in self._feed_articles.get(source_url, [])
+                    if not article.published_time or article.published_time >= cutoff_time
+                ]
             
+            # Don't hand empty bodies or non-feed pages (HTML error or login pages from
+            # misconfigured sources) to the parser; the feed sniffing check keeps feeds
+            # served under a generic content type
+            content = response.content
+            if not content:
+                logger.warning(f"Empty feed response from {source_url}")
+                return []
+            content_type = response.headers.get('Content-Type', '').lower()
+            if (not any(kind in content_type for kind in ('xml', 'rss', 'atom'))
+                    and _detect_feed_type(content) is None):
+                logger.warning(f"Not a feed ({content_type or 'no content type'}): {source_url}")
+                return []
+            
+            # Parse feed off the event loop
+            feed = await asyncio.get_running_loop().run_in_executor(
+                self.parse_executor, parse_feed, content
+            )
+            
+            if feed['bozo_exception']:
+                logger.warning(f"Feed parsing issues for {source_url}: {feed['bozo_exception']}")
+            
+            # Date-filter and build articles in one pass; content starts out as the
+            # summary and is replaced by the full page for the articles returned
+            source_title = feed['title'] or source_url
             articles = []
-            for entry in feed.entries:
-                # Parse publication date
-                published_time = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published_time = datetime(*entry.published_parsed[:6])
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    published_time = datetime(*entry.updated_parsed[:6])
-                
-                # Skip old articles
+            for entry in feed['entries']:
+                # Skip old articles (dates are already parsed by the worker)
+                published_time = entry['published_time']
                 if published_time and published_time < cutoff_time:
                     continue
-                  # Extract article data
-                article = {
-                    'title': entry.get('title', '').strip(),
-                    'link': entry.get('link', ''),
-                    'summary': self._clean_summary(entry.get('summary', '')),
-                    'published': entry.get('published', ''),
-                    'published_parsed': entry.get('published_parsed'),
-                    'source': feed.feed.get('title', source_url),
-                    'source_url': source_url
-                }
-                  # Fetch full article content with timeout
-                try:
-                    full_content = await asyncio.wait_for(
-                        self._fetch_full_article_content(article['link']),
-                        timeout=10.0  # Reduced timeout for content fetching
-                    )
-                    if full_content:
-                        article['content'] = full_content
-                        logger.debug(f"Fetched full content for: {article['title'][:50]}...")
-                    else:
-                        # Fallback to summary if content fetch fails
-                        article['content'] = article['summary']
-                except asyncio.TimeoutError:
-                    logger.warning(f"Content fetch timeout for: {article['title'][:50]}")
-                    article['content'] = article['summary']
-                except Exception as e:
-                    logger.warning(f"Content fetch error for {article['title'][:50]}: {e}")
-                    article['content'] = article['summary']
                 
-                # Only add if title exists
-                if article['title']:
-                    articles.append(article)
+                # Only keep articles with a title
+                title = entry['title'].strip()
+                if not title:
+                    continue
+                
+                summary = self._clean_summary(entry['summary'])
+                articles.append(Article(
+                    title=title,
+                    link=entry['link'],
+                    summary=summary,
+                    content=summary,
+                    published=entry['published'],
+                    published_time=published_time,
+                    source=source_title,
+                    source_url=source_url
+                ))
+            
+            self._feed_articles[source_url] = articles
+            
+            # Keep validators only for a cleanly parsed feed, so a 304 never stands in
+            # for a download whose articles were lost to a failed or partial parse
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if (etag or last_modified) and not feed['bozo_exception']:
+                self._feed_validators[source_url] = [etag, last_modified]
+            else:
+                self._feed_validators.pop(source_url, None)
             
             logger.info(f"Fetched {len(articles)} articles from {source_url}")
             return articles
@@ -166,14 +561,62 @@ class RSSFetcher:
             logger.error(f"Error fetching RSS from {source_url}: {e}")
             return []
     
+    async def _article_content(self, link: str, title: str, summary: str) -> str:
+        """Fetch an article's full text, falling back to its summary."""
+        if not link:
+            return summary
+        
+        key = _canonical_url(link)
+        cached = self._content_cache.get(key)
+        if cached is not None:
+            self._content_cache.move_to_end(key)
+            return cached
+        
+        fetch = self._content_fetches.get(key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._download_article_content(key, link, title))
+            self._content_fetches[key] = fetch
+            fetch.add_done_callback(lambda _: self._content_fetches.pop(key, None))
+        # Shielded so one waiter being cancelled doesn't cancel the shared download
+        return await asyncio.shield(fetch) or summary
+    
+    async def _download_article_content(self, key: str, link: str, title: str) -> str:
+        """Download and extract an article's full text with a timeout ('' on failure)."""
+        try:
+            # The download blocks, so it runs in a worker thread and its timeout only
+            # starts once this host has a free download slot; text extraction is
+            # CPU-bound, so it runs on the parse executor like feed parsing
+            host = urlsplit(link).netloc
+            async with self._host_semaphores[host]:
+                await self._host_limits[host].acquire()
+                html = await asyncio.wait_for(
+                    asyncio.to_thread(self._download_article_page, link),
+                    timeout=10.0  # Reduced timeout for content fetching
+                )
+            if not html:
+                return ""
+            full_content = await asyncio.get_running_loop().run_in_executor(
+                self.parse_executor, extract_article_text, html, link
+            )
+            if full_content:
+                logger.debug(f"Fetched full content for: {title[:50]}...")
+                self._content_cache[key] = full_content
+                if len(self._content_cache) > ARTICLE_CACHE_SIZE:
+                    self._content_cache.popitem(last=False)
+            return full_content
+        except asyncio.TimeoutError:
+            logger.warning(f"Content fetch timeout for: {title[:50]}")
+        except Exception as e:
+            logger.warning(f"Content fetch error for {title[:50]}: {e}")
+        return ""
+    
     def _clean_summary(self, summary: str) -> str:
         """Clean and truncate summary text."""
         if not summary:
             return ""
         
         # Remove HTML tags (basic cleaning)
-        import re
-        clean_summary = re.sub(r'<[^>]+>', '', summary)
+        clean_summary = _TAG_RE.sub('', summary)
         
         # Truncate to reasonable length
         if len(clean_summary) > 300:
@@ -181,115 +624,73 @@ class RSSFetcher:
         
         return clean_summary.strip()
     
-    def _deduplicate_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate articles based on title similarity."""
-        seen_titles = set()
+    def _deduplicate_articles(self, articles: List[Article]) -> List[Article]:
+        """Remove duplicate articles based on title similarity.
+        
+        Near-identical headlines from different feeds ("OpenAI launches GPT-5" vs
+        "OpenAI Launches GPT-5 model") count as duplicates. Candidates come from an
+        inverted shingle index, so each title is only compared with kept titles
+        that share a shingle with it.
+        """
         unique_articles = []
+        kept_shingles = []
+        index = defaultdict(list)
         
         for article in articles:
-            title = article.get('title', '').lower().strip()
+            shingles = _title_shingles(article.title)
+            if not shingles:
+                continue
+            
+            # Count shared shingles with each kept title, then check their Jaccard similarity
+            shared = defaultdict(int)
+            for shingle in shingles:
+                for kept in index.get(shingle, ()):
+                    shared[kept] += 1
+            if any(
+                count / (len(shingles) + len(kept_shingles[kept]) - count) >= TITLE_SIMILARITY_THRESHOLD
+                for kept, count in shared.items()
+            ):
+                continue
             
-            # Simple deduplication based on title
-            if title and title not in seen_titles:
-                seen_titles.add(title)
-                unique_articles.append(article)
+            for shingle in shingles:
+                index[shingle].append(len(kept_shingles))
+            kept_shingles.append(shingles)
+            unique_articles.append(article)
         
         return unique_articles
     
-    async def _fetch_full_article_content(self, article_url: str) -> str:
-        """Fetch the full text content of an article from its URL."""
-        if not article_url:
-            return ""
-        
-        try:
-            # Set headers to mimic a real browser
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-              # Fetch the article page with reduced timeout
-            response = requests.get(article_url, headers=headers, timeout=8)
+    def _download_article_page(self, article_url: str) -> bytes:
+        """Download an article page's HTML, up to MAX_ARTICLE_BYTES (blocking)."""
+        # Set headers to mimic a real browser
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': _ACCEPT_ENCODING,
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+        }
+        # Fetch the article page with reduced timeout, streaming so that only
+        # HTML is read, and only up to MAX_ARTICLE_BYTES of it
+        with self._session.get(article_url, headers=headers, timeout=8, stream=True) as response:
             response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            if content_type and 'html' not in content_type:
+                logger.debug(f"Skipping non-HTML content ({content_type}) at {article_url}")
+                return b""
             
-            # Parse HTML content
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'advertisement']):
-                element.decompose()
-            
-            # Try to find the main article content using common selectors
-            content_selectors = [
-                'article',
-                '[role="main"]',
-                '.post-content',
-                '.article-content',
-                '.entry-content',
-                '.content',
-                '.story-body',
-                '.article-body',
-                '.post-body',
-                'main',
-                '.main-content',
-                '#content',
-                '.article-text'
-            ]
-            
-            article_content = None
-            for selector in content_selectors:
-                elements = soup.select(selector)
-                if elements:
-                    # Get the largest element (likely the main content)
-                    article_content = max(elements, key=lambda x: len(x.get_text()))
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=65536):
+                body += chunk
+                if len(body) >= MAX_ARTICLE_BYTES:
                     break
-            
-            # If no specific content area found, try to extract paragraphs
-            if not article_content:
-                paragraphs = soup.find_all('p')
-                if len(paragraphs) >= 3:  # Ensure it's substantial content
-                    article_content = soup
-            
-            if article_content:
-                # Extract text and clean it
-                text = article_content.get_text()
-                
-                # Clean up the text
-                text = re.sub(r'\s+', ' ', text)  # Replace multiple whitespace with single space
-                text = re.sub(r'\n+', '\n', text)  # Replace multiple newlines with single newline
-                text = text.strip()
-                
-                # Remove common footer text and navigation elements
-                common_removals = [
-                    r'subscribe to our newsletter.*',
-                    r'sign up for.*newsletter.*',
-                    r'follow us on.*',
-                    r'share this article.*',
-                    r'related articles.*',
-                    r'recommended for you.*',
-                    r'advertisement.*'
-                ]
-                
-                for pattern in common_removals:
-                    text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-                
-                # Limit content length to avoid token limits
-                if len(text) > 8000:  # Reasonable limit for GPT processing
-                    text = text[:8000] + "..."
-                
-                logger.debug(f"Extracted {len(text)} characters from {article_url}")
-                return text
-            
-            logger.warning(f"Could not extract content from {article_url}")
-            return ""
-            
-        except Exception as e:
-            logger.error(f"Error fetching full content from {article_url}: {e}")
-            return ""
-
+        
+        return bytes(body)
+    
+    def close(self):
+        """Close the pooled HTTP session."""
+        self._session.close()
+    
     def get_source_info(self) -> Dict[str, Any]:
         """Get information about configured sources."""
         return {
@@ -2,7 +2,21 @@
 Utils package initialization.
 """
 
-from .text_generator import TextGenerator
-from .x_poster import XPoster
+import importlib
 
-__all__ = ['TextGenerator', 'XPoster']
+# Re-exports are resolved on first access so that importing a light submodule
+# (e.g. utils.state_store) doesn't pull in the OpenAI and X client stacks
+_EXPORTS = {
+    'TextGenerator': '.text_generator',
+    'get_text_generator': '.text_generator',
+    'XPoster': '.x_poster',
+    'get_x_poster': '.x_poster',
+}
+
+__all__ = ['TextGenerator', 'XPoster', 'get_text_generator', 'get_x_poster']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,150 @@
+"""
+Dedup Store - SQLite-backed record of already-handled URLs, shared by bot processes
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Set
+
+from .state_store import STATE_DIR
+from .url_lru import UrlLRU
+
+logger = logging.getLogger(__name__)
+
+# One database for all bots; rows are scoped per bot
+DEDUP_DB_PATH = os.path.join(STATE_DIR, "dedup.db")
+
+# Max host parameters per IN (...) query, under SQLite's lowest default limit
+_QUERY_CHUNK = 500
+
+
+def _signed(key: int) -> int:
+    """Map an unsigned 64-bit fingerprint onto SQLite's signed INTEGER range."""
+    return key - (1 << 64) if key >= (1 << 63) else key
+
+
+class DedupStore:
+    """Remembers URL fingerprints on disk so dedup survives restarts and spans processes.
+
+    Queries run on a thread of the store's own, since another bot process holding
+    the write lock can block one for up to the connection timeout.
+    """
+
+    def __init__(self, scope: str, path: str = DEDUP_DB_PATH, cache_size: int = 5000):
+        """Open (creating if needed) the store for one bot's scope."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.scope = scope
+        # One worker thread, so the connection is only ever used by one thread at a time
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"dedup-{scope}")
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        # WAL lets bot processes read while another one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sent ("
+            "scope TEXT NOT NULL, h INTEGER NOT NULL, ts INTEGER NOT NULL, "
+            "PRIMARY KEY (scope, h)) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sent_scope_ts ON sent (scope, ts)")
+        self._conn.commit()
+        # Fingerprints known to be stored, so repeat lookups skip the database
+        self._known = UrlLRU(cache_size)
+
+    async def _run(self, func, *args):
+        """Run a blocking store operation on the store's thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def seen(self, keys: Iterable[int]) -> Set[int]:
+        """Return which of the given fingerprints are already stored."""
+        return await self._run(self._seen, list(keys))
+
+    async def add(self, keys: Iterable[int]):
+        """Store fingerprints as handled now."""
+        keys = list(keys)
+        if keys:
+            await self._run(self._add, keys)
+
+    async def prune(self, max_age_seconds: int) -> int:
+        """Forget fingerprints older than max_age_seconds; returns how many were removed."""
+        return await self._run(self._prune, max_age_seconds)
+
+    async def count(self) -> int:
+        """Number of fingerprints stored for this scope."""
+        return await self._run(self._count)
+
+    def _seen(self, keys: Iterable[int]) -> Set[int]:
+        """Blocking body of seen(), run on the store's thread."""
+        found = set()
+        pending = []
+        for key in keys:
+            if self._known.contains_key(key):
+                found.add(key)
+            else:
+                pending.append(key)
+
+        try:
+            by_signed = {_signed(key): key for key in pending}
+            signed = list(by_signed)
+            for i in range(0, len(signed), _QUERY_CHUNK):
+                chunk = signed[i:i + _QUERY_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT h FROM sent WHERE scope = ? AND h IN ({','.join('?' * len(chunk))})",
+                    (self.scope, *chunk)
+                )
+                for (h,) in rows:
+                    key = by_signed[h]
+                    found.add(key)
+                    self._known.add_key(key)
+        except Exception as e:
+            logger.error("Error reading dedup store %s: %s", self.scope, e)
+
+        return found
+
+    def _add(self, keys: Iterable[int]):
+        """Blocking body of add(), run on the store's thread."""
+        try:
+            now = int(time.time())
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO sent (scope, h, ts) VALUES (?, ?, ?)",
+                    [(self.scope, _signed(key), now) for key in keys]
+                )
+            for key in keys:
+                self._known.add_key(key)
+        except Exception as e:
+            logger.error("Error writing dedup store %s: %s", self.scope, e)
+
+    def _prune(self, max_age_seconds: int) -> int:
+        """Blocking body of prune(), run on the store's thread."""
+        try:
+            with self._conn:
+                cursor = self._conn.execute(
+                    "DELETE FROM sent WHERE scope = ? AND ts < ?",
+                    (self.scope, int(time.time()) - max_age_seconds)
+                )
+            # Pruned fingerprints may still be cached as stored
+            if cursor.rowcount:
+                self._known.clear()
+            return cursor.rowcount
+        except Exception as e:
+            logger.error("Error pruning dedup store %s: %s", self.scope, e)
+            return 0
+
+    def _count(self) -> int:
+        """Blocking body of count(), run on the store's thread."""
+        try:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM sent WHERE scope = ?", (self.scope,)
+            ).fetchone()[0]
+        except Exception as e:
+            logger.error("Error counting dedup store %s: %s", self.scope, e)
+            return 0
+
+    def close(self):
+        """Wait for pending queries, then close the database connection."""
+        self._executor.shutdown(wait=True)
+        self._conn.close()
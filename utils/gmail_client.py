@@ -4,18 +4,89 @@ Gmail Client - Handles Gmail API authentication and email fetching
 
 import os
 import json
-import base64
+import asyncio
+import binascii
+import functools
 import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
 
 logger = logging.getLogger(__name__)
 
+# Sub-requests per Gmail batch call; the endpoint takes up to 100, but Gmail
+# rate-limits items of batches above 50
+GMAIL_BATCH_SIZE = 50
+
+# Response field masks: only what the client reads is serialized and sent
+_LIST_FIELDS = 'messages/id,nextPageToken'
+_MESSAGE_FIELDS = {
+    'full': 'id,threadId,snippet,labelIds,'
+            'payload(mimeType,headers,body(data,size),parts(mimeType,headers,body(data,size)))',
+    'metadata': 'id,threadId,snippet,labelIds,payload/headers',
+}
+
+# Most message IDs messages.batchModify accepts per call
+GMAIL_BATCH_MODIFY_SIZE = 1000
+
+# Most Gmail API requests in flight at once, kept under the per-user rate limit
+MAX_CONCURRENT_REQUESTS = 10
+
+# Subject terms that mark an email as a newsletter, as a ready-made query clause
+NEWSLETTER_INDICATORS = (
+    "newsletter", "digest", "weekly", "daily", "update",
+    "roundup", "briefing", "summary"
+)
+_NEWSLETTER_QUERY = "(" + " OR ".join(f"subject:{term}" for term in NEWSLETTER_INDICATORS) + ")"
+
+# Maps Gmail's URL-safe base64 alphabet onto the standard one, so part bodies
+# decode with binascii directly instead of through urlsafe_b64decode's copies
+_B64_TRANS = bytes.maketrans(b'-_', b'+/')
+
+_CHARSET_RE = re.compile(r'charset="?([\w.:-]+)', re.IGNORECASE)
+
+
+def _part_charset(part: Dict[str, Any]) -> str:
+    """Return the charset declared in a MIME part's Content-Type header, defaulting to UTF-8."""
+    for header in part.get('headers', ()):
+        if header['name'].lower() == 'content-type':
+            match = _CHARSET_RE.search(header['value'])
+            if match:
+                return match.group(1)
+            break
+    return 'utf-8'
+
+
+def _decode_part(part: Dict[str, Any]) -> str:
+    """Decode a MIME part's base64url body to text; empty parts are skipped without decoding."""
+    body = part.get('body', {})
+    data = body.get('data')
+    if not data or body.get('size') == 0:
+        return ""
+    raw = binascii.a2b_base64(data.encode('ascii').translate(_B64_TRANS))
+    try:
+        return raw.decode(_part_charset(part), 'replace')
+    except LookupError:
+        # Unknown charset name
+        return raw.decode('utf-8', 'replace')
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_email_date_cached(date_str: str) -> datetime:
+    """Parse an email Date header; memoized since the result depends only on the string."""
+    return parsedate_to_datetime(date_str)
+
+
 class GmailClient:
     """Gmail API client for fetching and processing emails."""
     
@@ -28,12 +99,27 @@ class GmailClient:
         self.token_path = token_path
         self.service = None
         self.credentials = None
+        
+        # Blocking API calls run on this pool so the event loop stays free
+        self._executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS, thread_name_prefix='gmail')
+        # httplib2 connections aren't thread-safe, so each pool thread sends its
+        # requests over its own authorized transport instead of the service's shared one
+        self._thread_local = threading.local()
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        
+        # Label name -> ID, loaded from Gmail on first use and kept up to date on create
+        self._label_cache: Optional[Dict[str, str]] = None
+        self._label_lock = asyncio.Lock()
     
     async def authenticate(self) -> bool:
         """Authenticate with Gmail API."""
         try:
-            # Load existing token if available
-            if os.path.exists(self.token_path):
+            # Already authenticated with a live token: nothing to reload or rebuild
+            if self.service and self.credentials and self.credentials.valid:
+                return True
+            
+            # Load existing token if available (only once; afterwards it is refreshed in memory)
+            if not self.credentials and os.path.exists(self.token_path):
                 self.credentials = Credentials.from_authorized_user_file(
                     self.token_path, self.SCOPES
                 )
@@ -41,7 +127,9 @@ class GmailClient:
             # If no valid credentials, run OAuth flow
             if not self.credentials or not self.credentials.valid:
                 if self.credentials and self.credentials.expired and self.credentials.refresh_token:
-                    self.credentials.refresh(Request())
+                    await asyncio.get_running_loop().run_in_executor(
+                        self._executor, self.credentials.refresh, Request()
+                    )
                 else:
                     if not os.path.exists(self.credentials_path):
                         logger.error(f"Gmail credentials file not found: {self.credentials_path}")
@@ -65,11 +153,42 @@ class GmailClient:
             logger.error(f"Gmail authentication failed: {e}")
             return False
     
+    async def _execute(self, request) -> Any:
+        """Run a Gmail API request (or batch) on the client's thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._execute_on_thread, request
+        )
+    
+    def _execute_on_thread(self, request) -> Any:
+        """Execute a request over the calling pool thread's own transport (blocking)."""
+        local = self._thread_local
+        # Rebuilt when the client re-authenticates with new credentials
+        if getattr(local, 'credentials', None) is not self.credentials:
+            local.http = AuthorizedHttp(self.credentials, http=build_http())
+            local.credentials = self.credentials
+        return request.execute(http=local.http)
+    
+    async def close(self):
+        """Release the Gmail service's HTTP connections and the thread pool."""
+        try:
+            if self.service:
+                self.service.close()
+            self._executor.shutdown(wait=False)
+        except Exception as e:
+            logger.error(f"Error closing Gmail client: {e}")
+    
     async def get_recent_emails(self, 
                                query: str = "", 
                                max_results: int = 10,
-                               hours_back: int = 24) -> List[Dict[str, Any]]:
-        """Get recent emails based on query."""
+                               hours_back: int = 24,
+                               format: str = 'full',
+                               metadata_headers: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get recent emails based on query.
+        
+        Callers that only need headers and the snippet should pass
+        format='metadata' (optionally with metadata_headers): the body is then
+        neither transferred nor decoded, and 'body' is left empty.
+        """
         try:
             if not self.service:
                 if not await self.authenticate():
@@ -85,18 +204,24 @@ class GmailClient:
                 search_query += f" {query}"
             
             # Search for messages
-            result = self.service.users().messages().list(
+            result = await self._execute(self.service.users().messages().list(
                 userId='me',
                 q=search_query,
-                maxResults=max_results
-            ).execute()
+                maxResults=max_results,
+                fields=_LIST_FIELDS
+            ))
+            
+            message_ids = [message['id'] for message in result.get('messages', [])]
             
-            messages = result.get('messages', [])
+            # Get message details, batched into as few round-trips as possible
+            fetched = await self._batch_get_messages(message_ids, format, metadata_headers)
             
-            # Get full message details
             emails = []
-            for message in messages:
-                email_data = await self._get_email_details(message['id'])
+            for message_id in message_ids:
+                message = fetched.get(message_id)
+                if not message:
+                    continue
+                email_data = await self._parse_message(message_id, message, format == 'full')
                 if email_data:
                     emails.append(email_data)
             
@@ -121,27 +246,19 @@ class GmailClient:
             
             # Add sender filters
             if sender_filters:
-                sender_query = " OR ".join([f"from:{sender}" for sender in sender_filters])
+                sender_query = " OR ".join(f"from:{sender}" for sender in sender_filters)
                 query_parts.append(f"({sender_query})")
             
             # Add subject filters
             if subject_filters:
-                subject_query = " OR ".join([f"subject:{subject}" for subject in subject_filters])
+                subject_query = " OR ".join(f"subject:{subject}" for subject in subject_filters)
                 query_parts.append(f"({subject_query})")
             
-            # Common newsletter indicators
-            newsletter_indicators = [
-                "newsletter", "digest", "weekly", "daily", "update", 
-                "roundup", "briefing", "summary"
-            ]
-            newsletter_query = " OR ".join([f"subject:{term}" for term in newsletter_indicators])
-            query_parts.append(f"({newsletter_query})")
+            # Common newsletter indicators (prebuilt once)
+            query_parts.append(_NEWSLETTER_QUERY)
             
             # Combine all filters
-            if query_parts:
-                query = " OR ".join(query_parts)
-            else:
-                query = newsletter_query
+            query = " OR ".join(query_parts)
             
             return await self.get_recent_emails(query, max_results=20, hours_back=hours_back)
             
@@ -149,22 +266,84 @@ class GmailClient:
             logger.error(f"Error getting newsletter emails: {e}")
             return []
     
-    async def _get_email_details(self, message_id: str) -> Optional[Dict[str, Any]]:
+    def _get_request(self, message_id: str, format: str = 'full',
+                     metadata_headers: Optional[List[str]] = None):
+        """Build a messages.get request in the given format, limited to the fields that are read."""
+        kwargs = {'userId': 'me', 'id': message_id, 'format': format}
+        if format == 'metadata' and metadata_headers:
+            kwargs['metadataHeaders'] = metadata_headers
+        if format in _MESSAGE_FIELDS:
+            kwargs['fields'] = _MESSAGE_FIELDS[format]
+        return self.service.users().messages().get(**kwargs)
+    
+    async def _batch_get_messages(self, message_ids: List[str], format: str = 'full',
+                                  metadata_headers: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Fetch messages through the Gmail batch endpoint, keyed by message ID."""
+        messages = {}
+        
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                logger.error(f"Error getting email details for {request_id}: {exception}")
+            else:
+                messages[request_id] = response
+        
+        for i in range(0, len(message_ids), GMAIL_BATCH_SIZE):
+            chunk = message_ids[i:i + GMAIL_BATCH_SIZE]
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for message_id in chunk:
+                batch.add(
+                    self._get_request(message_id, format, metadata_headers),
+                    request_id=message_id
+                )
+            
+            try:
+                await self._execute(batch)
+            except HttpError as e:
+                if not 400 <= e.resp.status < 500:
+                    raise
+                # Batch endpoint refused the call; fetch this chunk one message at a time
+                logger.warning(f"Gmail batch request failed ({e.resp.status}), fetching individually")
+                results = await asyncio.gather(
+                    *(self._fetch_message(message_id, format, metadata_headers) for message_id in chunk),
+                    return_exceptions=True
+                )
+                for message_id, result in zip(chunk, results):
+                    if isinstance(result, Exception):
+                        logger.error(f"Error getting email details for {message_id}: {result}")
+                    else:
+                        messages[message_id] = result
+        
+        return messages
+    
+    async def _fetch_message(self, message_id: str, format: str = 'full',
+                             metadata_headers: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Fetch one message without blocking the event loop."""
+        request = self._get_request(message_id, format, metadata_headers)
+        async with self._request_semaphore:
+            return await self._execute(request)
+    
+    async def _get_email_details(self, message_id: str, format: str = 'full',
+                                 metadata_headers: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """Get detailed information for a specific email."""
         try:
-            message = self.service.users().messages().get(
-                userId='me',
-                id=message_id,
-                format='full'
-            ).execute()
+            message = await self._fetch_message(message_id, format, metadata_headers)
+            return await self._parse_message(message_id, message, format == 'full')
             
+        except Exception as e:
+            logger.error(f"Error getting email details for {message_id}: {e}")
+            return None
+    
+    async def _parse_message(self, message_id: str, message: Dict[str, Any],
+                             with_body: bool = True) -> Optional[Dict[str, Any]]:
+        """Build the email record for a fetched Gmail message."""
+        try:
             # Extract headers
             headers = {}
             for header in message['payload'].get('headers', []):
                 headers[header['name'].lower()] = header['value']
             
-            # Extract body
-            body = await self._extract_email_body(message['payload'])
+            # Extract body (only full-format messages carry one)
+            body = await self._extract_email_body(message['payload']) if with_body else ""
             
             # Extract date
             date_str = headers.get('date', '')
@@ -184,35 +363,29 @@ class GmailClient:
             return email_data
             
         except Exception as e:
-            logger.error(f"Error getting email details for {message_id}: {e}")
+            logger.error(f"Error parsing email {message_id}: {e}")
             return None
     
     async def _extract_email_body(self, payload: Dict) -> str:
         """Extract email body from payload."""
         try:
-            body = ""
-            
             # Check if it's multipart
             if 'parts' in payload:
-                for part in payload['parts']:
-                    if part['mimeType'] == 'text/plain':
-                        data = part['body'].get('data', '')
-                        if data:
-                            body = base64.urlsafe_b64decode(data).decode('utf-8')
-                            break
-                    elif part['mimeType'] == 'text/html' and not body:
-                        data = part['body'].get('data', '')
-                        if data:
-                            # For now, store HTML as-is, could parse later
-                            body = base64.urlsafe_b64decode(data).decode('utf-8')
-            else:
-                # Single part message
-                if payload['mimeType'] in ['text/plain', 'text/html']:
-                    data = payload['body'].get('data', '')
-                    if data:
-                        body = base64.urlsafe_b64decode(data).decode('utf-8')
+                parts = payload['parts']
+                # Plain text wins; HTML (stored as-is, could parse later) is the fallback
+                for mime_type in ('text/plain', 'text/html'):
+                    for part in parts:
+                        if part['mimeType'] == mime_type:
+                            body = _decode_part(part)
+                            if body:
+                                return body
+                return ""
+            
+            # Single part message
+            if payload['mimeType'] in ('text/plain', 'text/html'):
+                return _decode_part(payload)
             
-            return body
+            return ""
             
         except Exception as e:
             logger.error(f"Error extracting email body: {e}")
@@ -221,8 +394,7 @@ class GmailClient:
     def _parse_email_date(self, date_str: str) -> Optional[datetime]:
         """Parse email date string to datetime object."""
         try:
-            from email.utils import parsedate_to_datetime
-            return parsedate_to_datetime(date_str)
+            return _parse_email_date_cached(date_str)
         except Exception as e:
             logger.error(f"Error parsing email date {date_str}: {e}")
             return None
@@ -233,11 +405,11 @@ class GmailClient:
             if not self.service:
                 return False
             
-            self.service.users().messages().modify(
+            await self._execute(self.service.users().messages().modify(
                 userId='me',
                 id=message_id,
                 body={'removeLabelIds': ['UNREAD']}
-            ).execute()
+            ))
             
             return True
             
@@ -245,6 +417,45 @@ class GmailClient:
             logger.error(f"Error marking email as read: {e}")
             return False
     
+    async def mark_as_read_batch(self, message_ids: List[str]) -> bool:
+        """Mark several emails as read with as few requests as possible."""
+        try:
+            if not self.service:
+                return False
+            
+            await self._batch_modify(message_ids, {'removeLabelIds': ['UNREAD']})
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error marking emails as read: {e}")
+            return False
+    
+    async def add_label_batch(self, message_ids: List[str], label_name: str) -> bool:
+        """Add a label to several emails with as few requests as possible."""
+        try:
+            if not self.service:
+                return False
+            
+            # Get or create label
+            label_id = await self._get_or_create_label(label_name)
+            if not label_id:
+                return False
+            
+            await self._batch_modify(message_ids, {'addLabelIds': [label_id]})
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error adding label to emails: {e}")
+            return False
+    
+    async def _batch_modify(self, message_ids: List[str], changes: Dict[str, List[str]]):
+        """Apply the same label changes to many messages, one batchModify call per chunk."""
+        for i in range(0, len(message_ids), GMAIL_BATCH_MODIFY_SIZE):
+            await self._execute(self.service.users().messages().batchModify(
+                userId='me',
+                body={'ids': message_ids[i:i + GMAIL_BATCH_MODIFY_SIZE], **changes}
+            ))
+    
     async def add_label(self, message_id: str, label_name: str) -> bool:
         """Add a label to an email."""
         try:
@@ -256,11 +467,11 @@ class GmailClient:
             if not label_id:
                 return False
             
-            self.service.users().messages().modify(
+            await self._execute(self.service.users().messages().modify(
                 userId='me',
                 id=message_id,
                 body={'addLabelIds': [label_id]}
-            ).execute()
+            ))
             
             return True
             
@@ -271,28 +482,33 @@ class GmailClient:
     async def _get_or_create_label(self, label_name: str) -> Optional[str]:
         """Get existing label or create new one."""
         try:
-            # List existing labels
-            result = self.service.users().labels().list(userId='me').execute()
-            labels = result.get('labels', [])
-            
-            # Check if label exists
-            for label in labels:
-                if label['name'] == label_name:
-                    return label['id']
-            
-            # Create new label
-            label_object = {
-                'name': label_name,
-                'labelListVisibility': 'labelShow',
-                'messageListVisibility': 'show'
-            }
-            
-            created_label = self.service.users().labels().create(
-                userId='me',
-                body=label_object
-            ).execute()
-            
-            return created_label['id']
+            # Serialized so concurrent add_label calls share one listing and one create
+            async with self._label_lock:
+                if self._label_cache is None:
+                    result = await self._execute(self.service.users().labels().list(userId='me'))
+                    self._label_cache = {
+                        label['name']: label['id'] for label in result.get('labels', [])
+                    }
+                
+                # Check if label exists
+                label_id = self._label_cache.get(label_name)
+                if label_id:
+                    return label_id
+                
+                # Create new label
+                label_object = {
+                    'name': label_name,
+                    'labelListVisibility': 'labelShow',
+                    'messageListVisibility': 'show'
+                }
+                
+                created_label = await self._execute(self.service.users().labels().create(
+                    userId='me',
+                    body=label_object
+                ))
+                
+                self._label_cache[label_name] = created_label['id']
+                return created_label['id']
             
         except Exception as e:
             logger.error(f"Error getting/creating label {label_name}: {e}")
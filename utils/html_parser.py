@@ -0,0 +1,10 @@
+"""
+HTML Parser - BeautifulSoup tree builder choice shared by every module that parses HTML
+"""
+
+import importlib.util
+
+# libxml2-backed lxml parses far faster than the pure-Python html.parser, which
+# remains the fallback; kept in its own module so the feed fetcher and its parse
+# workers don't import the web scraper stack just for this choice
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
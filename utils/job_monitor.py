@@ -3,31 +3,57 @@ Job Monitor - Monitors job boards for new job postings
 """
 
 import asyncio
+import hashlib
 import logging
-import re
 import requests
-from typing import Dict, List, Optional, Any, Set
+import soupsieve
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Pattern, Set, Tuple
 from datetime import datetime, timedelta
-from urllib.parse import urljoin, urlparse, quote_plus
+from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 import time
 
+from .html_parser import HTML_PARSER
+from .web_scraper import compile_keywords, create_session
+
 logger = logging.getLogger(__name__)
 
+# Job cards parsed per listing page
+MAX_JOBS_PER_PAGE = 20
+
+# Listing pages are read up to this many (decompressed) bytes; the first
+# MAX_JOBS_PER_PAGE cards sit well within it, the rest is scripts and footers
+MAX_LISTING_BYTES = 1_500_000
+
+# Seconds a board's search results are reused without asking the board again;
+# after that they are revalidated with the page's ETag/Last-Modified
+SEARCH_CACHE_TTL = 300
+
+# Processed job IDs are forgotten after this many seconds, and the oldest are
+# dropped early once this many are remembered
+PROCESSED_JOBS_MAX_AGE = 7 * 24 * 3600
+PROCESSED_JOBS_MAX_SIZE = 50000
+
 class JobMonitor:
     """Monitors job boards for new job postings based on search criteria."""
     
     def __init__(self):
         """Initialize the job monitor."""
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        
-        # Cache to avoid re-processing same job postings
-        self.processed_jobs = set()
+        # Cache to avoid re-processing same job postings: job ID -> time it was
+        # marked, oldest first, bounded in age and size
+        self.processed_jobs: OrderedDict[str, float] = OrderedDict()
         self.last_check_time = {}
         
+        # One request at a time per job board; different boards are searched concurrently
+        self._board_semaphores: Dict[str, asyncio.Semaphore] = {}
+        
+        # Last parsed results per (board, search params), with the page's validators
+        self._search_cache: Dict[Tuple[str, Tuple], Dict[str, Any]] = {}
+        
+        # Compiled keyword filters, keyed by keyword list (filters rarely change between searches)
+        self._keyword_patterns: Dict[Tuple[str, ...], Optional[Pattern]] = {}
+        
         # Supported job boards with their API/scraping configurations
         self.job_boards = {
             'indeed': {
@@ -70,6 +96,19 @@ class JobMonitor:
                 }
             }
         }
+        
+        # One pooled session for the monitor's lifetime: each board keeps a warm
+        # keep-alive connection across searches instead of a new TLS handshake per poll
+        self.session = create_session(max_hosts=len(self.job_boards), max_per_host=2)
+        
+        # Every board's CSS selectors compiled once, instead of re-parsed on each select
+        self._board_selectors = {
+            board_name: {
+                field: soupsieve.compile(selector)
+                for field, selector in board_config['selectors'].items()
+            }
+            for board_name, board_config in self.job_boards.items()
+        }
     
     async def search_jobs(self, search_config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Search for jobs based on configuration."""
@@ -83,25 +122,26 @@ class JobMonitor:
                 logger.warning("No search query provided")
                 return []
             
-            all_jobs = []
-            
-            # Search each specified job board
+            valid_boards = []
             for board_name in job_boards:
                 if board_name not in self.job_boards:
                     logger.warning(f"Unsupported job board: {board_name}")
                     continue
-                
-                try:
-                    board_jobs = await self._search_job_board(board_name, query, location, filters)
-                    all_jobs.extend(board_jobs)
-                    logger.info(f"Found {len(board_jobs)} jobs from {board_name}")
-                    
-                    # Rate limiting between job boards
-                    await asyncio.sleep(2)
-                    
-                except Exception as e:
-                    logger.error(f"Error searching {board_name}: {str(e)}")
+                valid_boards.append(board_name)
+            
+            # Search all specified job boards concurrently
+            results = await asyncio.gather(
+                *(self._search_job_board(board_name, query, location, filters) for board_name in valid_boards),
+                return_exceptions=True
+            )
+            
+            all_jobs = []
+            for board_name, board_jobs in zip(valid_boards, results):
+                if isinstance(board_jobs, Exception):
+                    logger.error(f"Error searching {board_name}: {str(board_jobs)}")
                     continue
+                all_jobs.extend(board_jobs)
+                logger.info(f"Found {len(board_jobs)} jobs from {board_name}")
             
             # Remove duplicates and filter results
             unique_jobs = self._deduplicate_jobs(all_jobs)
@@ -121,40 +161,81 @@ class JobMonitor:
             
             # Build search URL
             base_url = board_config['base_url']
-            search_params = {}
+            # Raw values: requests URL-encodes params itself, so pre-quoting would double-encode
+            search_params = {
+                param: template.format(query=query, location=location) if '{' in template else template
+                for param, template in board_config['search_params'].items()
+            }
             
-            for param, template in board_config['search_params'].items():
-                if '{query}' in template:
-                    search_params[param] = template.format(query=quote_plus(query))
-                elif '{location}' in template:
-                    search_params[param] = template.format(location=quote_plus(location))
-                else:
-                    search_params[param] = template
+            # Same search done recently: reuse its results without a request
+            cache_key = (board_name, tuple(sorted(search_params.items())))
+            cached = self._search_cache.get(cache_key)
+            if cached and time.monotonic() - cached['fetched_at'] < SEARCH_CACHE_TTL:
+                return [dict(job) for job in cached['jobs']]
             
-            # Make request
-            response = self.session.get(base_url, params=search_params, timeout=30)
-            response.raise_for_status()
+            headers = {}
+            if cached:
+                if cached['etag']:
+                    headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    headers['If-Modified-Since'] = cached['last_modified']
             
-            # Parse results
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Make request off the event loop, never overlapping another request to this board
+            semaphore = self._board_semaphores.setdefault(board_name, asyncio.Semaphore(1))
+            async with semaphore:
+                response, body = await asyncio.to_thread(
+                    self._download_listing_page, base_url, search_params, headers
+                )
+            
+            # Listings unchanged since the last search: reuse what was parsed then
+            if response.status_code == 304 and cached:
+                logger.debug(f"Job listings not modified on {board_name}")
+                cached['fetched_at'] = time.monotonic()
+                return [dict(job) for job in cached['jobs']]
+            
+            # Parse results off the event loop, so other boards' downloads keep going
+            soup = await asyncio.to_thread(BeautifulSoup, body, HTML_PARSER)
             jobs = await self._parse_job_listings(soup, board_config, board_name)
             
-            return jobs
+            self._search_cache[cache_key] = {
+                'fetched_at': time.monotonic(),
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'jobs': jobs
+            }
+            return [dict(job) for job in jobs]
             
         except Exception as e:
             logger.error(f"Error searching {board_name}: {str(e)}")
             return []
     
+    def _download_listing_page(self, url: str, params: Dict[str, str],
+                               headers: Dict[str, str]) -> Tuple[requests.Response, bytes]:
+        """Download a listing page, up to MAX_LISTING_BYTES of it (blocking)."""
+        # Streamed, so a huge page stops downloading once enough of it has arrived
+        with self.session.get(url, params=params, headers=headers, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            if response.status_code == 304:
+                return response, b""
+            
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=65536):
+                body += chunk
+                if len(body) >= MAX_LISTING_BYTES:
+                    break
+        
+        return response, bytes(body)
+    
     async def _parse_job_listings(self, soup: BeautifulSoup, board_config: Dict[str, Any], board_name: str) -> List[Dict[str, Any]]:
         """Parse job listings from HTML."""
         try:
             jobs = []
-            selectors = board_config['selectors']
+            selectors = self._board_selectors[board_name]
             
-            # Find all job cards
-            job_cards = soup.select(selectors['job_cards'])
+            # Find the first job cards only
+            job_cards = selectors['job_cards'].select(soup, limit=MAX_JOBS_PER_PAGE)
             
-            for card in job_cards[:20]:  # Limit to first 20 results
+            for card in job_cards:
                 try:
                     job_data = {
                         'source': board_name,
@@ -162,27 +243,27 @@ class JobMonitor:
                     }
                     
                     # Extract job details
-                    title_elem = card.select_one(selectors['title'])
+                    title_elem = selectors['title'].select_one(card)
                     if title_elem:
                         job_data['title'] = title_elem.get_text(strip=True)
                     
-                    company_elem = card.select_one(selectors['company'])
+                    company_elem = selectors['company'].select_one(card)
                     if company_elem:
                         job_data['company'] = company_elem.get_text(strip=True)
                     
-                    location_elem = card.select_one(selectors['location'])
+                    location_elem = selectors['location'].select_one(card)
                     if location_elem:
                         job_data['location'] = location_elem.get_text(strip=True)
                     
-                    summary_elem = card.select_one(selectors['summary'])
+                    summary_elem = selectors['summary'].select_one(card)
                     if summary_elem:
                         job_data['summary'] = summary_elem.get_text(strip=True)[:500]
                     
-                    date_elem = card.select_one(selectors['date'])
+                    date_elem = selectors['date'].select_one(card)
                     if date_elem:
                         job_data['posted_date'] = date_elem.get_text(strip=True)
                     
-                    link_elem = card.select_one(selectors['link'])
+                    link_elem = selectors['link'].select_one(card)
                     if link_elem:
                         href = link_elem.get('href', '')
                         if href:
@@ -216,10 +297,9 @@ class JobMonitor:
         company = job_data.get('company', '')
         source = job_data.get('source', '')
         
-        # Create a simple hash-like ID
-        job_string = f"{title}_{company}_{source}".lower()
-        job_string = re.sub(r'[^a-zA-Z0-9_]', '', job_string)
-        return job_string[:50]
+        # Fixed-length digest of the identifying fields (no truncation collisions)
+        job_string = f"{title}|{company}|{source}".lower()
+        return hashlib.blake2b(job_string.encode('utf-8', 'ignore'), digest_size=12).hexdigest()
     
     def _deduplicate_jobs(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate job postings."""
@@ -243,17 +323,22 @@ class JobMonitor:
             required_keywords = filters.get('required_keywords', [])
             max_age_days = filters.get('max_age_days', 7)
             
+            self._expire_processed()
+            
+            # Each keyword list is a single pattern, so a job's text is scanned once per list
+            exclude_pattern = self._keyword_pattern(exclude_keywords)
+            required_pattern = self._keyword_pattern(required_keywords)
+            
             for job in jobs:
-                # Check exclude keywords
-                if exclude_keywords:
-                    job_text = f"{job.get('title', '')} {job.get('summary', '')}".lower()
-                    if any(keyword.lower() in job_text for keyword in exclude_keywords):
+                if exclude_pattern or required_pattern:
+                    job_text = f"{job.get('title', '')} {job.get('summary', '')}"
+                    
+                    # Check exclude keywords
+                    if exclude_pattern and exclude_pattern.search(job_text):
                         continue
-                
-                # Check required keywords
-                if required_keywords:
-                    job_text = f"{job.get('title', '')} {job.get('summary', '')}".lower()
-                    if not any(keyword.lower() in job_text for keyword in required_keywords):
+                    
+                    # Check required keywords
+                    if required_pattern and not required_pattern.search(job_text):
                         continue
                 
                 # Check if already processed
@@ -268,9 +353,49 @@ class JobMonitor:
             logger.error(f"Error filtering jobs: {str(e)}")
             return jobs
     
+    def _keyword_pattern(self, keywords: List[str]) -> Optional[Pattern]:
+        """Return the compiled case-insensitive pattern for a keyword list, compiling it once."""
+        key = tuple(keywords or ())
+        if key not in self._keyword_patterns:
+            self._keyword_patterns[key] = compile_keywords(keywords)
+        return self._keyword_patterns[key]
+    
     def mark_as_processed(self, job_id: str):
         """Mark a job as processed."""
-        self.processed_jobs.add(job_id)
+        self.mark_batch_as_processed([job_id])
+    
+    def mark_batch_as_processed(self, job_ids: List[str]):
+        """Mark several jobs as processed in a single call."""
+        now = time.time()
+        processed_jobs = self.processed_jobs
+        for job_id in job_ids:
+            processed_jobs[job_id] = now
+            processed_jobs.move_to_end(job_id)
+        self._expire_processed(now)
+    
+    def restore_processed(self, entries: List[Any]):
+        """Restore processed jobs from a snapshot of [job_id, marked_at] pairs (oldest first)."""
+        for job_id, marked_at in entries:
+            self.processed_jobs[job_id] = marked_at
+        self._expire_processed()
+    
+    def processed_snapshot(self) -> List[List[Any]]:
+        """Return processed jobs as [job_id, marked_at] pairs (oldest first) for persistence."""
+        return [[job_id, marked_at] for job_id, marked_at in self.processed_jobs.items()]
+    
+    def _expire_processed(self, now: Optional[float] = None):
+        """Forget processed jobs past their max age, and the oldest beyond the size cap."""
+        cutoff = (now or time.time()) - PROCESSED_JOBS_MAX_AGE
+        processed_jobs = self.processed_jobs
+        while processed_jobs and (
+            len(processed_jobs) > PROCESSED_JOBS_MAX_SIZE
+            or next(iter(processed_jobs.values())) < cutoff
+        ):
+            processed_jobs.popitem(last=False)
+    
+    def close(self):
+        """Close the pooled HTTP session."""
+        self.session.close()
     
     def get_processed_count(self) -> int:
         """Get count of processed jobs."""
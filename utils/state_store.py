@@ -0,0 +1,56 @@
+"""
+State Store - Periodic JSON snapshots of bot state (dedup sets, caches)
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Snapshots live next to the logs/ and credentials/ directories
+STATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "state")
+
+# How often bots snapshot their state to disk (seconds)
+PERSIST_INTERVAL = 60
+
+
+def state_path(name: str) -> str:
+    """Return the snapshot file path for a state name."""
+    return os.path.join(STATE_DIR, f"{name}.json")
+
+
+def load_state(path: str, default: Any = None) -> Any:
+    """Load a JSON snapshot, returning default if it is missing or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            return json.loads(f.read())
+    except FileNotFoundError:
+        return default
+    except Exception as e:
+        logger.error("Error loading state from %s: %s", path, e)
+        return default
+
+
+def _write_and_replace(path: str, data: bytes):
+    """Write data to a temp file and atomically swap it into place."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+async def save_state(path: str, state: Any) -> bool:
+    """Serialize state and write it atomically without blocking the event loop."""
+    try:
+        # Compact separators: snapshots are only read back by load_state, and
+        # large dedup/cache snapshots serialize and write noticeably faster
+        data = json.dumps(state, separators=(',', ':'), check_circular=False).encode('utf-8')
+        await asyncio.to_thread(_write_and_replace, path, data)
+        return True
+    except Exception as e:
+        logger.error("Error saving state to %s: %s", path, e)
+        return False
@@ -131,3 +131,14 @@ Format your response as:
             'future_question': "How will this reshape competitive dynamics in the coming months?",
             'sector': 'technology'
         }
+
+
+# Process-wide instance so every bot shares one OpenAI client (and its connection pool)
+_text_generator: Optional[TextGenerator] = None
+
+def get_text_generator() -> TextGenerator:
+    """Return the shared TextGenerator, creating it on first use."""
+    global _text_generator
+    if _text_generator is None:
+        _text_generator = TextGenerator()
+    return _text_generator
@@ -0,0 +1,43 @@
+"""
+URL LRU - Bounded, fingerprint-keyed memory of seen URLs for deduplication
+"""
+
+import hashlib
+from collections import OrderedDict
+
+
+def url_key(url: str) -> int:
+    """Return a compact 64-bit fingerprint of a URL."""
+    return int.from_bytes(hashlib.blake2b((url or '').encode(), digest_size=8).digest(), 'little')
+
+
+class UrlLRU:
+    """Remembers up to `cap` URLs by fingerprint, forgetting the least recently seen first."""
+
+    def __init__(self, cap: int = 20000):
+        """Create an empty LRU holding at most cap fingerprints."""
+        self.cap = cap
+        self._keys = OrderedDict()
+
+    def contains_key(self, key: int) -> bool:
+        """Check a fingerprint, refreshing it on a hit."""
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return True
+        return False
+
+    def add_key(self, key: int) -> bool:
+        """Remember a fingerprint; returns False if it was already known."""
+        if self.contains_key(key):
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self.cap:
+            self._keys.popitem(last=False)
+        return True
+
+    def clear(self):
+        """Forget every fingerprint."""
+        self._keys.clear()
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -6,24 +6,47 @@ import asyncio
 import logging
 import re
 import requests
-from typing import Dict, List, Optional, Any, Set
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Any, Pattern, Set
 from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse, urlencode
 from bs4 import BeautifulSoup
 import feedparser
 import time
 
+from .html_parser import HTML_PARSER
+
 logger = logging.getLogger(__name__)
 
+def compile_keywords(keywords: List[str]) -> Optional[Pattern]:
+    """Compile keywords into one case-insensitive pattern matching any of them."""
+    if not keywords:
+        return None
+    # Longest first so overlapping keywords prefer the fuller match
+    alternatives = sorted(set(keywords), key=len, reverse=True)
+    return re.compile("|".join(map(re.escape, alternatives)), re.IGNORECASE)
+
+def create_session(max_hosts: int = 20, max_per_host: int = 8) -> requests.Session:
+    """Create a session that keeps connections alive to many sites at once.
+    
+    Sessions are meant to be long-lived and shared across scrapes, so TLS
+    handshakes are only paid when a site's pooled connection has gone away.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=max_per_host)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    })
+    return session
+
 class WebScraper:
     """Scrapes content from specified websites and extracts articles."""
     
-    def __init__(self):
-        """Initialize the web scraper."""
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+    def __init__(self, session: Optional[requests.Session] = None):
+        """Initialize the web scraper, optionally on a caller-owned pooled session."""
+        self.session = session or create_session()
         
         # Cache to avoid re-scraping same URLs
         self.scraped_urls = set()
@@ -88,10 +111,10 @@ class WebScraper:
     async def _scrape_html_page(self, url: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Scrape articles from an HTML page."""
         try:
-            response = self.session.get(url, timeout=10)
+            response = await asyncio.to_thread(self.session.get, url, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER)
             articles = []
             
             # Get custom selectors or use defaults
@@ -126,7 +149,7 @@ class WebScraper:
     async def _scrape_rss_feed(self, url: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Scrape articles from an RSS feed."""
         try:
-            response = self.session.get(url, timeout=10)
+            response = await asyncio.to_thread(self.session.get, url, timeout=10)
             response.raise_for_status()
             
             feed = feedparser.parse(response.content)
@@ -160,7 +183,7 @@ class WebScraper:
     async def _scrape_sitemap(self, url: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Scrape articles from a sitemap."""
         try:
-            response = self.session.get(url, timeout=10)
+            response = await asyncio.to_thread(self.session.get, url, timeout=10)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'xml')
@@ -254,11 +277,13 @@ class WebScraper:
         """Filter articles based on configuration."""
         filtered = []
         
-        # Get filter criteria
-        keywords = config.get('keywords', [])
-        exclude_keywords = config.get('exclude_keywords', [])
-        min_content_length = config.get('min_content_length', 100)
-        max_age_hours = config.get('max_age_hours', 24)
+        # Get filter criteria (bots nest them under 'filters'); keywords are matched
+        # with one precompiled pattern per list instead of a substring test per keyword
+        filters = config.get('filters', config)
+        keyword_pattern = filters.get('keyword_pattern') or compile_keywords(filters.get('keywords', []))
+        exclude_pattern = compile_keywords(filters.get('exclude_keywords', []))
+        min_content_length = filters.get('min_content_length', 100)
+        max_age_hours = filters.get('max_age_hours', 24)
         
         cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
         
@@ -273,22 +298,13 @@ class WebScraper:
                 continue
             
             # Keyword filters
-            if keywords:
-                title_lower = article.get('title', '').lower()
-                content_lower = content.lower()
-                
-                if not any(keyword.lower() in title_lower or keyword.lower() in content_lower 
-                          for keyword in keywords):
-                    continue
+            title = article.get('title', '')
+            if keyword_pattern and not (keyword_pattern.search(title) or keyword_pattern.search(content)):
+                continue
             
             # Exclude keywords
-            if exclude_keywords:
-                title_lower = article.get('title', '').lower()
-                content_lower = content.lower()
-                
-                if any(keyword.lower() in title_lower or keyword.lower() in content_lower 
-                       for keyword in exclude_keywords):
-                    continue
+            if exclude_pattern and (exclude_pattern.search(title) or exclude_pattern.search(content)):
+                continue
             
             # Age filter (if published date is available)
             if article.get('published_date') and article['published_date'] < cutoff_time:
@@ -6,6 +6,7 @@ import os
 import requests
 import logging
 from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
 from requests_oauthlib import OAuth1
 
 logger = logging.getLogger(__name__)
@@ -34,6 +35,10 @@ class XPoster:
         
         self.api_base = "https://api.twitter.com/2"
         
+        # One pooled session for all X API calls so keep-alive connections are reused
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        
         # Check if we have any credentials
         has_bearer = bool(self.bearer_token)
         has_oauth = bool(self.api_key and self.api_secret and self.access_token and self.access_token_secret)
@@ -76,7 +81,7 @@ class XPoster:
                     "Content-Type": "application/json"
                 }
                 
-                response = requests.post(
+                response = self.session.post(
                     f"{self.api_base}/tweets",
                     json=tweet_data,
                     headers=headers,
@@ -93,7 +98,7 @@ class XPoster:
                     signature_type='AUTH_HEADER'
                 )
                 
-                response = requests.post(
+                response = self.session.post(
                     f"{self.api_base}/tweets",
                     json=tweet_data,
                     auth=auth,
@@ -120,6 +125,10 @@ class XPoster:
         # Media upload would require additional implementation
         return await self.post_tweet(text)
     
+    def close(self):
+        """Close the pooled HTTP session."""
+        self.session.close()
+    
     def set_credentials(self, bearer_token: str = None, api_key: str = None, 
                        api_secret: str = None, access_token: str = None, 
                        access_token_secret: str = None):
@@ -143,7 +152,7 @@ class XPoster:
         try:
             if self.bearer_token:
                 # Test with a simple API call (get user info)
-                response = requests.get(
+                response = self.session.get(
                     f"{self.api_base}/users/me",
                     headers={
                         "Authorization": f"Bearer {self.bearer_token}"
@@ -160,7 +169,7 @@ class XPoster:
                     signature_type='AUTH_HEADER'
                 )
                 
-                response = requests.get(
+                response = self.session.get(
                     f"{self.api_base}/users/me",
                     auth=auth,
                     timeout=10
@@ -179,7 +188,7 @@ class XPoster:
         
         try:
             if self.bearer_token:
-                response = requests.get(
+                response = self.session.get(
                     f"{self.api_base}/tweets",
                     headers={
                         "Authorization": f"Bearer {self.bearer_token}"
@@ -195,7 +204,7 @@ class XPoster:
                     signature_type='AUTH_HEADER'
                 )
                 
-                response = requests.get(
+                response = self.session.get(
                     f"{self.api_base}/tweets",
                     auth=auth,
                     timeout=10
@@ -213,3 +222,17 @@ class XPoster:
         except Exception as e:
             logger.error(f"Error getting rate limit status: {e}")
             return {"error": str(e)}
+
+
+# Shared posters keyed by credentials, so bots using the same X account reuse one instance
+_x_posters: Dict[tuple, XPoster] = {}
+
+def get_x_poster(bearer_token: Optional[str] = None, api_key: Optional[str] = None,
+                 api_secret: Optional[str] = None, access_token: Optional[str] = None,
+                 access_token_secret: Optional[str] = None) -> XPoster:
+    """Return the shared XPoster for a set of credentials, creating it on first use."""
+    key = (bearer_token, api_key, api_secret, access_token, access_token_secret)
+    poster = _x_posters.get(key)
+    if poster is None:
+        poster = _x_posters[key] = XPoster(*key)
+    return poster